@@ -9,15 +9,70 @@ from abc import ABC, abstractmethod
 from datetime import datetime
 import json
 import csv
+import logging
+import queue
 import sqlite3
-from collections import defaultdict
+import sys
+import threading
+from collections import Counter, defaultdict
+from heapq import nlargest
+from itertools import repeat
+from operator import itemgetter
 import numpy as np
 from pathlib import Path
 
 
+logger = logging.getLogger(__name__)
+
+# Engagement score weights; 60s of attention and 5 zones count as fully engaged
+DURATION_WEIGHT = 0.3
+EXPLORATION_WEIGHT = 0.2
+CONFIDENCE_WEIGHT = 0.2
+CONCENTRATION_WEIGHT = 0.3
+FULL_ENGAGEMENT_SECONDS = 60.0
+FULL_EXPLORATION_ZONES = 5.0
+
+
+# sqlite3 adapters are process-wide, so they are only registered once a
+# database writer is actually created
+_numpy_adapters_registered = False
+
+
+def _register_numpy_adapters() -> None:
+    """Let NumPy scalars from the tracker and analytics bind as plain SQLite numbers."""
+    global _numpy_adapters_registered
+    if _numpy_adapters_registered:
+        return
+    
+    for np_type, py_type in ((np.float64, float), (np.float32, float),
+                             (np.int64, int), (np.int32, int)):
+        sqlite3.register_adapter(np_type, py_type)
+    _numpy_adapters_registered = True
+
+
+def _calculate_engagement(session: Any) -> float:
+    """Calculate engagement score for a single session."""
+    # Dwell time concentration (how focused was the attention)
+    if session.zone_durations and session.total_duration > 0:
+        concentration = max(session.zone_durations.values()) / session.total_duration
+    else:
+        concentration = 0.0
+    
+    return (min(session.total_duration / FULL_ENGAGEMENT_SECONDS, 1.0) * DURATION_WEIGHT
+            + min(len(session.unique_zones_visited) / FULL_EXPLORATION_ZONES, 1.0) * EXPLORATION_WEIGHT
+            + session.avg_confidence * CONFIDENCE_WEIGHT
+            + concentration * CONCENTRATION_WEIGHT)
+
+
 @dataclass
 class SessionAnalytics:
     """Analytics data for a tracking session."""
+    # Declared by hand: dataclass(slots=True) needs Python 3.10
+    __slots__ = ('session_id', 'timestamp', 'duration', 'zones_visited',
+                 'zone_transitions', 'avg_confidence', 'primary_zone',
+                 'primary_zone_duration', 'dwell_times', 'peak_interest_zones',
+                 'engagement_score', 'path_complexity')
+    
     session_id: int
     timestamp: datetime
     duration: float
@@ -35,6 +90,10 @@ class SessionAnalytics:
 @dataclass
 class AggregateAnalytics:
     """Aggregate analytics across multiple sessions."""
+    __slots__ = ('total_sessions', 'avg_session_duration', 'total_time_tracked',
+                 'zone_popularity', 'avg_zones_per_session', 'peak_hours',
+                 'conversion_zones', 'avg_engagement_score')
+    
     total_sessions: int
     avg_session_duration: float
     total_time_tracked: float
@@ -72,56 +131,66 @@ class ConsoleAnalyticsWriter(IAnalyticsWriter):
         self.session_count = 0
     
     def write_session(self, session_data: Any) -> None:
-        print(len(session_data.zone_durations),"-- zome durations")
-        print(len(session_data.gaze_history),"-- gaze history")
         """Write session data to console."""
         self.session_count += 1
         
-        print("\n" + "="*60)
-        print(f"FACE TRACKING SESSION COMPLETED - ID: {session_data.id}")
-        print("="*60)
-        print(f"Total Duration: {session_data.total_duration:.2f} seconds")
-        print(f"Frames: {session_data.start_frame} to {session_data.end_frame}")
-        print(f"Average Confidence: {session_data.avg_confidence:.2f}")
-        print(f"\nZones Visited: {', '.join(session_data.unique_zones_visited)}")
+        # Build the whole report and emit it with a single write
+        lines = [
+            "",
+            "="*60,
+            f"FACE TRACKING SESSION COMPLETED - ID: {session_data.id}",
+            "="*60,
+            f"Total Duration: {session_data.total_duration:.2f} seconds",
+            f"Frames: {session_data.start_frame} to {session_data.end_frame}",
+            f"Average Confidence: {session_data.avg_confidence:.2f}",
+            "",
+            f"Zones Visited: {', '.join(session_data.unique_zones_visited)}"
+        ]
         
         if session_data.total_duration > 0:
-            print("\nTime Spent in Each Zone:")
+            lines += ["", "Time Spent in Each Zone:"]
             sorted_zones = sorted(session_data.zone_durations.items(), 
-                                key=lambda x: x[1], reverse=True)
+                                key=itemgetter(1), reverse=True)
             for zone, duration in sorted_zones:
                 percentage = (duration / session_data.total_duration) * 100
-                print(f"  {zone}: {duration:.2f}s ({percentage:.1f}%)")
+                lines.append(f"  {zone}: {duration:.2f}s ({percentage:.1f}%)")
         
         if self.verbose and session_data.peak_interest_zones:
-            print("\nPeak Interest Zones:")
+            lines += ["", "Peak Interest Zones:"]
             for zone, duration in session_data.peak_interest_zones[:3]:
-                print(f"  - {zone}: {duration:.2f}s")
+                lines.append(f"  - {zone}: {duration:.2f}s")
         
-        print("="*60 + "\n")
+        lines += ["="*60, ""]
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def write_aggregate(self, aggregate_data: AggregateAnalytics) -> None:
         """Write aggregate data to console."""
-        print("\n" + "="*60)
-        print("OVERALL STATISTICS")
-        print("="*60)
-        print(f"Total Sessions: {aggregate_data.total_sessions}")
-        print(f"Average Session Duration: {aggregate_data.avg_session_duration:.2f}s")
-        print(f"Total Time Tracked: {aggregate_data.total_time_tracked:.2f}s")
-        print(f"Average Zones per Session: {aggregate_data.avg_zones_per_session:.1f}")
-        print(f"Average Engagement Score: {aggregate_data.avg_engagement_score:.2f}")
-        
-        print("\nZone Popularity (by total time):")
+        lines = [
+            "",
+            "="*60,
+            "OVERALL STATISTICS",
+            "="*60,
+            f"Total Sessions: {aggregate_data.total_sessions}",
+            f"Average Session Duration: {aggregate_data.avg_session_duration:.2f}s",
+            f"Total Time Tracked: {aggregate_data.total_time_tracked:.2f}s",
+            f"Average Zones per Session: {aggregate_data.avg_zones_per_session:.1f}",
+            f"Average Engagement Score: {aggregate_data.avg_engagement_score:.2f}",
+            "",
+            "Zone Popularity (by total time):"
+        ]
+        
         sorted_zones = sorted(aggregate_data.zone_popularity.items(), 
-                            key=lambda x: x[1], reverse=True)
+                            key=itemgetter(1), reverse=True)
         for zone, duration in sorted_zones:
             percentage = (duration / aggregate_data.total_time_tracked) * 100
-            print(f"  {zone}: {duration:.2f}s ({percentage:.1f}%)")
+            lines.append(f"  {zone}: {duration:.2f}s ({percentage:.1f}%)")
         
         if aggregate_data.peak_hours:
-            print("\nPeak Hours:")
+            lines += ["", "Peak Hours:"]
             for hour, count in aggregate_data.peak_hours[:5]:
-                print(f"  {hour:02d}:00 - {count} sessions")
+                lines.append(f"  {hour:02d}:00 - {count} sessions")
+        
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def close(self) -> None:
         """No cleanup needed for console output."""
@@ -131,11 +200,47 @@ class ConsoleAnalyticsWriter(IAnalyticsWriter):
 class DatabaseAnalyticsWriter(IAnalyticsWriter):
     """Write analytics to SQLite database."""
     
+    # Statements are reused as-is so sqlite3's statement cache always hits
+    _INSERT_SESSION = '''
+        INSERT INTO sessions (
+            session_id, start_frame, end_frame, duration, zones_visited,
+            zone_transitions, avg_confidence, primary_zone, primary_zone_duration,
+            engagement_score, path_complexity
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    _INSERT_ZONE_DURATION = '''
+        INSERT INTO zone_durations (session_id, zone_name, duration, percentage)
+        VALUES (?, ?, ?, ?)
+    '''
+    _INSERT_GAZE = '''
+        INSERT INTO gaze_history (
+            session_id, frame, zone, yaw, pitch, 
+            position_x, position_y, confidence, timestamp
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    _INSERT_AGGREGATE = '''
+        INSERT INTO aggregate_stats (
+            total_sessions, avg_session_duration, total_time_tracked,
+            avg_zones_per_session, avg_engagement_score
+        ) VALUES (?, ?, ?, ?, ?)
+    '''
+    
     def __init__(self, db_path: str = "gaze_analytics.db"):
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
+        _register_numpy_adapters()
+        # Writes may come from AsyncAnalyticsWriter's background thread
+        self.conn = sqlite3.connect(db_path, check_same_thread=False,
+                                    cached_statements=256)
+        self._configure_connection()
         self._create_tables()
     
+    def _configure_connection(self) -> None:
+        """Tune SQLite for a single local writer: WAL journal, relaxed fsync, larger cache."""
+        for pragma in ("journal_mode=WAL", "synchronous=NORMAL", "temp_store=MEMORY",
+                       "cache_size=-65536", "mmap_size=268435456", "busy_timeout=5000",
+                       "foreign_keys=ON"):
+            self.conn.execute(f"PRAGMA {pragma}")
+    
     def _create_tables(self) -> None:
         """Create database tables if they don't exist."""
         cursor = self.conn.cursor()
@@ -161,19 +266,19 @@ class DatabaseAnalyticsWriter(IAnalyticsWriter):
         # Zone durations table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS zone_durations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                id INTEGER PRIMARY KEY,
                 session_id INTEGER,
                 zone_name TEXT,
                 duration REAL,
                 percentage REAL,
-                FOREIGN KEY (session_id) REFERENCES sessions(session_id)
+                FOREIGN KEY (session_id) REFERENCES sessions(session_id) ON DELETE CASCADE
             )
         ''')
         
         # Gaze history table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS gaze_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                id INTEGER PRIMARY KEY,
                 session_id INTEGER,
                 frame INTEGER,
                 zone TEXT,
@@ -183,14 +288,14 @@ class DatabaseAnalyticsWriter(IAnalyticsWriter):
                 position_y INTEGER,
                 confidence REAL,
                 timestamp REAL,
-                FOREIGN KEY (session_id) REFERENCES sessions(session_id)
+                FOREIGN KEY (session_id) REFERENCES sessions(session_id) ON DELETE CASCADE
             )
         ''')
         
         # Aggregate statistics table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS aggregate_stats (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                id INTEGER PRIMARY KEY,
                 timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
                 total_sessions INTEGER,
                 avg_session_duration REAL,
@@ -200,78 +305,79 @@ class DatabaseAnalyticsWriter(IAnalyticsWriter):
             )
         ''')
         
+        # Per-session lookups on the child tables
+        cursor.execute("CREATE INDEX IF NOT EXISTS ix_zd_sid ON zone_durations(session_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS ix_gh_sid_frame ON gaze_history(session_id, frame)")
+        
         self.conn.commit()
     
     def write_session(self, session_data: Any) -> None:
         """Write session data to database."""
-        cursor = self.conn.cursor()
-        
         # Calculate analytics
         analytics = self._calculate_session_analytics(session_data)
         
-        # Insert main session data
-        cursor.execute('''
-            INSERT INTO sessions (
-                session_id, start_frame, end_frame, duration, zones_visited,
-                zone_transitions, avg_confidence, primary_zone, primary_zone_duration,
-                engagement_score, path_complexity
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            session_data.id,
-            session_data.start_frame,
-            session_data.end_frame,
-            session_data.total_duration,
-            len(session_data.unique_zones_visited),
-            session_data.total_zone_transitions,
-            session_data.avg_confidence,
-            analytics.primary_zone,
-            analytics.primary_zone_duration,
-            analytics.engagement_score,
-            analytics.path_complexity
-        ))
-        
-        # Insert zone durations
-        for zone, duration in session_data.zone_durations.items():
-            percentage = (duration / session_data.total_duration * 100 
-                         if session_data.total_duration > 0 else 0)
-            cursor.execute('''
-                INSERT INTO zone_durations (session_id, zone_name, duration, percentage)
-                VALUES (?, ?, ?, ?)
-            ''', (session_data.id, zone, duration, percentage))
-        
-        # Insert gaze history (sample every 10th record to reduce size)
-        for i, gaze in enumerate(session_data.gaze_history):
-            if i % 10 == 0:  # Sample rate
-                cursor.execute('''
-                    INSERT INTO gaze_history (
-                        session_id, frame, zone, yaw, pitch, 
-                        position_x, position_y, confidence, timestamp
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    session_data.id,
-                    gaze.frame,
-                    gaze.zone,
-                    gaze.yaw,
-                    gaze.pitch,
-                    gaze.position[0],
-                    gaze.position[1],
-                    gaze.confidence,
-                    gaze.timestamp
-                ))
+        # Percentage factor is the same for every zone; compute it once
+        session_id = session_data.id
+        to_percent = (100.0 / session_data.total_duration 
+                      if session_data.total_duration > 0 else 0.0)
+        zone_rows = [
+            (session_id, zone, duration, duration * to_percent)
+            for zone, duration in session_data.zone_durations.items()
+        ]
+        
+        # Sample every 10th gaze record to reduce size. Columns are taken from strided
+        # views of the history's arrays, so no GazeRecord objects are built
+        history = session_data.gaze_history
+        zone_names = history.zone_names
+        positions = history.positions[::10]
+        gaze_rows = zip(
+            repeat(session_id),
+            history.frames[::10].tolist(),
+            [zone_names[zone_id] for zone_id in history.zone_ids[::10].tolist()],
+            history.yaws[::10].tolist(),
+            history.pitches[::10].tolist(),
+            positions[:, 0].tolist(),
+            positions[:, 1].tolist(),
+            history.confidences[::10].tolist(),
+            history.timestamps[::10].tolist()
+        )
         
-        self.conn.commit()
+        # One transaction per session: committed on success, rolled back on error
+        with self.conn:
+            cursor = self.conn.cursor()
+            
+            # Insert main session data
+            cursor.execute(self._INSERT_SESSION, (
+                session_id,
+                session_data.start_frame,
+                session_data.end_frame,
+                session_data.total_duration,
+                len(session_data.unique_zones_visited),
+                session_data.total_zone_transitions,
+                session_data.avg_confidence,
+                analytics.primary_zone,
+                analytics.primary_zone_duration,
+                analytics.engagement_score,
+                analytics.path_complexity
+            ))
+            
+            # Insert zone durations
+            cursor.executemany(self._INSERT_ZONE_DURATION, zone_rows)
+            
+            # Insert gaze history
+            cursor.executemany(self._INSERT_GAZE, gaze_rows)
     
     def _calculate_session_analytics(self, session_data: Any) -> SessionAnalytics:
         """Calculate detailed analytics for a session."""
         # Find primary zone
         if session_data.zone_durations:
             primary_zone = max(session_data.zone_durations.items(), 
-                             key=lambda x: x[1])
+                             key=itemgetter(1))
         else:
             primary_zone = ("Unknown", 0)
         
         # Calculate engagement score (0-1)
-        engagement_score = self._calculate_engagement_score(session_data)
+        engagement_score = _calculate_engagement(session_data)
         
         # Calculate path complexity
         path_complexity = (session_data.total_zone_transitions / 
@@ -292,41 +398,11 @@ class DatabaseAnalyticsWriter(IAnalyticsWriter):
             path_complexity=path_complexity
         )
     
-    def _calculate_engagement_score(self, session_data: Any) -> float:
-        """Calculate engagement score based on various factors."""
-        factors = []
-        
-        # Duration factor (normalize to 0-1, assuming 60s is high engagement)
-        duration_score = min(session_data.total_duration / 60, 1.0)
-        factors.append(duration_score * 0.3)
-        
-        # Zone exploration factor
-        exploration_score = min(len(session_data.unique_zones_visited) / 5, 1.0)
-        factors.append(exploration_score * 0.2)
-        
-        # Confidence factor
-        factors.append(session_data.avg_confidence * 0.2)
-        
-        # Dwell time concentration (how focused was the attention)
-        if session_data.zone_durations and session_data.total_duration > 0:
-            durations = list(session_data.zone_durations.values())
-            concentration = max(durations) / session_data.total_duration
-            factors.append(concentration * 0.3)
-        else:
-            factors.append(0)
-        
-        return sum(factors)
-    
     def write_aggregate(self, aggregate_data: AggregateAnalytics) -> None:
         """Write aggregate statistics to database."""
         cursor = self.conn.cursor()
         
-        cursor.execute('''
-            INSERT INTO aggregate_stats (
-                total_sessions, avg_session_duration, total_time_tracked,
-                avg_zones_per_session, avg_engagement_score
-            ) VALUES (?, ?, ?, ?, ?)
-        ''', (
+        cursor.execute(self._INSERT_AGGREGATE, (
             aggregate_data.total_sessions,
             aggregate_data.avg_session_duration,
             aggregate_data.total_time_tracked,
@@ -342,15 +418,36 @@ class DatabaseAnalyticsWriter(IAnalyticsWriter):
 
 
 class JSONAnalyticsWriter(IAnalyticsWriter):
-    """Write analytics to JSON files."""
+    """Write analytics to JSON files.
+    
+    json_format 'files' writes session_<id>.json for each session and
+    all_sessions.json alongside the aggregate. 'ndjson' appends sessions to a
+    single sessions.ndjson stream instead, so nothing accumulates in memory
+    and no file is ever rewritten.
+    
+    indent only applies to the per-session files (None writes them compactly);
+    NDJSON lines are always compact and the aggregate report is always
+    indented for reading by hand.
+    """
     
-    def __init__(self, output_dir: str = "analytics_output"):
+    def __init__(self, output_dir: str = "analytics_output", 
+                 indent: Optional[int] = 2, json_format: str = 'files'):
+        if json_format not in ('files', 'ndjson'):
+            raise ValueError(f"Unknown JSON format: {json_format}")
+        
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
-        self.sessions = []
+        self.indent = indent
+        self.json_format = json_format
+        self.sessions: List[Dict[str, Any]] = []  # only kept for all_sessions.json
+        
+        self._sessions_fp = None
+        if json_format == 'ndjson':
+            self.sessions_file = self.output_dir / "sessions.ndjson"
+            self._sessions_fp = open(self.sessions_file, 'a', buffering=1 << 20)
     
     def write_session(self, session_data: Any) -> None:
-        """Write session data to JSON."""
+        """Write session data to its own file or the NDJSON stream."""
         session_dict = {
             'id': session_data.id,
             'timestamp': datetime.now().isoformat(),
@@ -364,31 +461,39 @@ class JSONAnalyticsWriter(IAnalyticsWriter):
             'peak_interest_zones': session_data.peak_interest_zones
         }
         
+        if self._sessions_fp is not None:
+            # One compact JSON document per line
+            self._sessions_fp.write(json.dumps(session_dict, separators=(',', ':')) + '\n')
+            return
+        
         self.sessions.append(session_dict)
         
         # Write individual session file
         session_file = self.output_dir / f"session_{session_data.id}.json"
-        with open(session_file, 'w') as f:
-            json.dump(session_dict, f, indent=2)
+        session_file.write_text(json.dumps(session_dict, indent=self.indent))
     
     def write_aggregate(self, aggregate_data: AggregateAnalytics) -> None:
         """Write aggregate data to JSON."""
         aggregate_dict = asdict(aggregate_data)
         aggregate_dict['timestamp'] = datetime.now().isoformat()
         
-        # Write aggregate file
+        # Make sure every session written so far is on disk
+        if self._sessions_fp is not None:
+            self._sessions_fp.flush()
+        
+        # Serialize in one pass and write once; json.dump issues a write per chunk
         aggregate_file = self.output_dir / "aggregate_analytics.json"
-        with open(aggregate_file, 'w') as f:
-            json.dump(aggregate_dict, f, indent=2)
+        aggregate_file.write_text(json.dumps(aggregate_dict, indent=2))
         
-        # Write all sessions file
-        all_sessions_file = self.output_dir / "all_sessions.json"
-        with open(all_sessions_file, 'w') as f:
-            json.dump(self.sessions, f, indent=2)
+        if self._sessions_fp is None:
+            # Write all sessions file
+            all_sessions_file = self.output_dir / "all_sessions.json"
+            all_sessions_file.write_text(json.dumps(self.sessions, indent=self.indent))
     
     def close(self) -> None:
-        """No cleanup needed for JSON writer."""
-        pass
+        """Close the session stream, if any."""
+        if self._sessions_fp is not None:
+            self._sessions_fp.close()
 
 
 class CompositeAnalyticsWriter(IAnalyticsWriter):
@@ -396,16 +501,19 @@ class CompositeAnalyticsWriter(IAnalyticsWriter):
     
     def __init__(self, writers: List[IAnalyticsWriter]):
         self.writers = writers
+        # Bind the per-event methods once instead of looking them up per call
+        self._write_session_fns = tuple(w.write_session for w in writers)
+        self._write_aggregate_fns = tuple(w.write_aggregate for w in writers)
     
     def write_session(self, session_data: Any) -> None:
         """Write session data to all writers."""
-        for writer in self.writers:
-            writer.write_session(session_data)
+        for write_session in self._write_session_fns:
+            write_session(session_data)
     
     def write_aggregate(self, aggregate_data: AggregateAnalytics) -> None:
         """Write aggregate data to all writers."""
-        for writer in self.writers:
-            writer.write_aggregate(aggregate_data)
+        for write_aggregate in self._write_aggregate_fns:
+            write_aggregate(aggregate_data)
     
     def close(self) -> None:
         """Close all writers."""
@@ -413,6 +521,44 @@ class CompositeAnalyticsWriter(IAnalyticsWriter):
             writer.close()
 
 
+class AsyncAnalyticsWriter(IAnalyticsWriter):
+    """Forward analytics to another writer on a background thread."""
+    
+    def __init__(self, writer: IAnalyticsWriter):
+        self.writer = writer
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="analytics-writer",
+                                        daemon=True)
+        self._thread.start()
+    
+    def _run(self) -> None:
+        """Drain queued writes in order until the close sentinel arrives."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            
+            write, data = item
+            try:
+                write(data)
+            except Exception:
+                logger.exception("Analytics write failed")
+    
+    def write_session(self, session_data: Any) -> None:
+        """Queue session data; returns without waiting for I/O."""
+        self._queue.put((self.writer.write_session, session_data))
+    
+    def write_aggregate(self, aggregate_data: AggregateAnalytics) -> None:
+        """Queue aggregate data; returns without waiting for I/O."""
+        self._queue.put((self.writer.write_aggregate, aggregate_data))
+    
+    def close(self) -> None:
+        """Flush pending writes, then close the wrapped writer."""
+        self._queue.put(None)
+        self._thread.join()
+        self.writer.close()
+
+
 class AnalyticsProcessor:
     """Process tracking sessions and generate analytics."""
     
@@ -424,34 +570,43 @@ class AnalyticsProcessor:
         if not sessions:
             return self._empty_aggregate()
         
-        # Calculate aggregate metrics
+        # Gather per-session scalars once, then reduce in NumPy
         total_sessions = len(sessions)
-        total_time = sum(s.total_duration for s in sessions)
+        durations = np.fromiter((s.total_duration for s in sessions),
+                                dtype=np.float64, count=total_sessions)
+        zone_counts = np.fromiter((len(s.unique_zones_visited) for s in sessions),
+                                  dtype=np.int32, count=total_sessions)
+        confidences = np.fromiter((s.avg_confidence for s in sessions),
+                                  dtype=np.float64, count=total_sessions)
+        concentrations = np.fromiter(
+            (max(s.zone_durations.values()) / s.total_duration
+             if s.zone_durations and s.total_duration > 0 else 0
+             for s in sessions),
+            dtype=np.float64, count=total_sessions)
+        
+        total_time = float(durations.sum())
         avg_duration = total_time / total_sessions
         
         # Zone popularity
-        zone_totals = defaultdict(float)
+        zone_totals = Counter()
         for session in sessions:
-            for zone, duration in session.zone_durations.items():
-                zone_totals[zone] += duration
+            zone_totals.update(session.zone_durations)
         
         # Average zones per session
-        avg_zones = np.mean([len(s.unique_zones_visited) for s in sessions])
+        avg_zones = float(zone_counts.mean())
         
-        # Calculate engagement scores
-        engagement_scores = []
-        for session in sessions:
-            score = self._calculate_session_engagement(session)
-            engagement_scores.append(score)
-        avg_engagement = np.mean(engagement_scores) if engagement_scores else 0
+        # Engagement scores, vectorized form of _calculate_engagement
+        engagement_scores = (np.minimum(durations / FULL_ENGAGEMENT_SECONDS, 1.0) * DURATION_WEIGHT
+                             + np.minimum(zone_counts / FULL_EXPLORATION_ZONES, 1.0) * EXPLORATION_WEIGHT
+                             + confidences * CONFIDENCE_WEIGHT
+                             + concentrations * CONCENTRATION_WEIGHT)
+        avg_engagement = float(engagement_scores.mean())
         
         # Peak hours (simplified - would need actual timestamps)
         peak_hours = self._calculate_peak_hours(sessions)
         
         # Conversion zones (zones with longest dwell times)
-        conversion_zones = sorted(zone_totals.keys(), 
-                                key=lambda z: zone_totals[z], 
-                                reverse=True)[:3]
+        conversion_zones = [zone for zone, _ in zone_totals.most_common(3)]
         
         return AggregateAnalytics(
             total_sessions=total_sessions,
@@ -464,28 +619,6 @@ class AnalyticsProcessor:
             avg_engagement_score=avg_engagement
         )
     
-    def _calculate_session_engagement(self, session: Any) -> float:
-        """Calculate engagement score for a session."""
-        # Similar to DatabaseAnalyticsWriter implementation
-        factors = []
-        
-        duration_score = min(session.total_duration / 60, 1.0)
-        factors.append(duration_score * 0.3)
-        
-        exploration_score = min(len(session.unique_zones_visited) / 5, 1.0)
-        factors.append(exploration_score * 0.2)
-        
-        factors.append(session.avg_confidence * 0.2)
-        
-        if session.zone_durations and session.total_duration > 0:
-            durations = list(session.zone_durations.values())
-            concentration = max(durations) / session.total_duration
-            factors.append(concentration * 0.3)
-        else:
-            factors.append(0)
-        
-        return sum(factors)
-    
     def _calculate_peak_hours(self, sessions: List[Any]) -> List[Tuple[int, int]]:
         """Calculate peak hours from sessions."""
         # This is a simplified implementation
@@ -497,11 +630,8 @@ class AnalyticsProcessor:
             hour = (9 + i) % 24  # Assuming starting at 9 AM
             hour_counts[hour] += 1
         
-        # Sort by count and return top 5
-        sorted_hours = sorted(hour_counts.items(), 
-                            key=lambda x: x[1], 
-                            reverse=True)
-        return sorted_hours[:5]
+        # Top 5 by count
+        return nlargest(5, hour_counts.items(), key=itemgetter(1))
     
     def _empty_aggregate(self) -> AggregateAnalytics:
         """Return empty aggregate analytics."""
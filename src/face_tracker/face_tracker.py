@@ -1,6 +1,10 @@
-from typing import Dict, List, Tuple, Optional, Set
+from typing import Dict, List, Mapping, Tuple, Optional, Set
 from dataclasses import dataclass, field
 from collections import defaultdict
+from heapq import nlargest
+from operator import itemgetter
+from types import MappingProxyType
+import sys
 import numpy as np
 from abc import ABC, abstractmethod
 
@@ -17,6 +21,159 @@ class GazeRecord:
     timestamp: Optional[float] = None
 
 
+class GazeHistory:
+    """Gaze history stored column-wise: one NumPy array per GazeRecord field.
+    
+    Appending writes into preallocated arrays (doubled when full) instead of
+    allocating a record per frame. len(), iteration and indexing still hand
+    back GazeRecord objects, so readers can treat it like a list of records.
+    
+    Zones are stored as small integer ids into zone_names, so the zone column
+    is a plain array too.
+    
+    With max_length set it acts as a ring buffer: only the newest max_length
+    records are kept. zone_transitions counts every zone change appended,
+    including ones whose records have since been evicted.
+    """
+    
+    def __init__(self, capacity: int = 64, max_length: Optional[int] = None):
+        if max_length is not None:
+            capacity = max(2, min(capacity, max_length))
+        self.max_length = max_length
+        self.zone_transitions = 0
+        self._start = 0 # rows before _start have been evicted
+        self._size = 0 # one past the last row in use
+        self._frame = np.empty(capacity, dtype=np.int64)
+        self._yaw = np.empty(capacity, dtype=np.float64)
+        self._pitch = np.empty(capacity, dtype=np.float64)
+        self._position = np.empty((capacity, 2), dtype=np.int64)
+        self._confidence = np.empty(capacity, dtype=np.float64)
+        self._timestamp = np.empty(capacity, dtype=np.float64)
+        self._zone_id = np.empty(capacity, dtype=np.int16)
+        self.zone_names: List[str] = [] # zone id -> name
+        self._zone_lookup: Dict[str, int] = {} # name -> zone id
+        self._last_zone_id = -1
+    
+    def append(self, frame: int, zone: str, yaw: float, pitch: float,
+               position: Tuple[int, int], confidence: float, timestamp: float) -> None:
+        """Add one gaze measurement, evicting the oldest if max_length is reached."""
+        if self._size == len(self._frame):
+            self._make_room()
+        
+        zone_id = self._zone_lookup.get(zone)
+        if zone_id is None:
+            zone_id = self._zone_lookup[zone] = len(self.zone_names)
+            self.zone_names.append(zone)
+        if self._size > self._start and zone_id != self._last_zone_id:
+            self.zone_transitions += 1
+        self._last_zone_id = zone_id
+        
+        i = self._size
+        self._frame[i] = frame
+        self._yaw[i] = yaw
+        self._pitch[i] = pitch
+        self._position[i] = position
+        self._confidence[i] = confidence
+        self._timestamp[i] = timestamp
+        self._zone_id[i] = zone_id
+        self._size += 1
+        
+        if self.max_length is not None and self._size - self._start > self.max_length:
+            self._start += 1
+    
+    def _make_room(self) -> None:
+        """Free space at the end: reclaim evicted rows, or double the capacity."""
+        capacity = len(self._frame)
+        # Reclaim in place once at least half the arrays are evicted rows, so
+        # every row is moved O(1) times; otherwise grow
+        if self._start * 2 < capacity:
+            capacity *= 2
+            if self.max_length is not None:
+                # At 2 * max_length the next _make_room always compacts
+                capacity = min(capacity, 2 * self.max_length)
+        
+        count = self._size - self._start
+        for name in ('_frame', '_yaw', '_pitch', '_position', '_confidence', '_timestamp', '_zone_id'):
+            old = getattr(self, name)
+            new = old if len(old) == capacity else np.empty((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:count] = old[self._start:self._size]
+            setattr(self, name, new)
+        
+        self._start = 0
+        self._size = count
+    
+    @property
+    def zone_ids(self) -> np.ndarray:
+        """Zone id of each record (index into zone_names)."""
+        return self._zone_id[self._start:self._size]
+    
+    @property
+    def zones(self) -> List[str]:
+        """Zone name of each record."""
+        names = self.zone_names
+        return [names[zone_id] for zone_id in self.zone_ids.tolist()]
+    
+    @property
+    def frames(self) -> np.ndarray:
+        """Frame number of each record."""
+        return self._frame[self._start:self._size]
+    
+    @property
+    def yaws(self) -> np.ndarray:
+        """Yaw angle of each record."""
+        return self._yaw[self._start:self._size]
+    
+    @property
+    def pitches(self) -> np.ndarray:
+        """Pitch angle of each record."""
+        return self._pitch[self._start:self._size]
+    
+    @property
+    def positions(self) -> np.ndarray:
+        """Face center (x, y) of each record, shape (n, 2)."""
+        return self._position[self._start:self._size]
+    
+    @property
+    def confidences(self) -> np.ndarray:
+        """Detection confidence of each record."""
+        return self._confidence[self._start:self._size]
+    
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Timestamp in seconds of each record."""
+        return self._timestamp[self._start:self._size]
+    
+    def _record(self, i: int) -> GazeRecord:
+        """Build the GazeRecord for array row i."""
+        x, y = self._position[i].tolist()
+        return GazeRecord(
+            frame=int(self._frame[i]),
+            zone=self.zone_names[self._zone_id[i]],
+            yaw=float(self._yaw[i]),
+            pitch=float(self._pitch[i]),
+            position=(x, y),
+            confidence=float(self._confidence[i]),
+            timestamp=float(self._timestamp[i])
+        )
+    
+    def __len__(self) -> int:
+        return self._size - self._start
+    
+    def __iter__(self):
+        for i in range(self._start, self._size):
+            yield self._record(i)
+    
+    def __getitem__(self, index):
+        length = self._size - self._start
+        if isinstance(index, slice):
+            return [self._record(self._start + i) for i in range(*index.indices(length))]
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("gaze history index out of range")
+        return self._record(self._start + index)
+
+
 @dataclass
 class FaceDetection:
     """Represents a detected face in a single frame."""
@@ -28,6 +185,7 @@ class FaceDetection:
     zone: str = "Unknown"
     confidence: float = 0.0
     face_center: Optional[Tuple[int, int]] = None
+    mesh_cached: bool = False # pose reused from the tracked face instead of a fresh FaceMesh run
 
 
 @dataclass
@@ -38,11 +196,18 @@ class TrackedFace:
     first_seen: int
     last_seen: int
     missing_frames: int = 0
-    gaze_history: List[GazeRecord] = field(default_factory=list)
+    gaze_history: GazeHistory = field(default_factory=GazeHistory)
     zone_durations: Dict[str, float] = field(default_factory=lambda: defaultdict(float)) # zone -> total duration in seconds
     current_zone: str = "Unknown"
     zone_start_frame: int = 0 # frame when the current zone was first seen needed because of zone transitions
     confidence: float = 0.0
+    unique_zones: Set[str] = field(default_factory=set) # zones seen so far, kept in step with gaze_history
+    confidence_sum: float = 0.0 # running total over gaze_history, for an O(1) average at finalize
+    confidence_count: int = 0
+    landmarks: Optional[object] = None # last FaceMesh result, reusable while the face stays still
+    yaw: float = 0.0
+    pitch: float = 0.0
+    frames_since_mesh: int = 0 # consecutive updates that reused a cached pose
 
 
 @dataclass
@@ -53,7 +218,7 @@ class TrackingSession:
     end_frame: int
     total_duration: float
     zone_durations: Dict[str, float]
-    gaze_history: List[GazeRecord] # Full gaze history during the session
+    gaze_history: GazeHistory # Gaze history during the session (newest records if capped)
     unique_zones_visited: List[str]
     avg_confidence: float
     total_zone_transitions: int = 0
@@ -69,14 +234,18 @@ class ITracker(ABC):
         pass
     
     @abstractmethod
-    def get_active_faces(self) -> Dict[int, TrackedFace]:
+    def get_active_faces(self) -> Mapping[int, TrackedFace]:
         """Get currently tracked faces."""
         pass
     
     @abstractmethod
-    def get_completed_sessions(self) -> List[TrackingSession]:
+    def get_completed_sessions(self) -> Tuple[TrackingSession, ...]:
         """Get completed tracking sessions."""
         pass
+    
+    def get_completed_count(self) -> int:
+        """Get the number of completed tracking sessions."""
+        return len(self.get_completed_sessions())
 
     def add_session_callback(self, callback):
         """Add callback to be called when a session is completed."""
@@ -90,19 +259,23 @@ class FaceTracker(ITracker):
                  iou_threshold: float = 0.3,
                  max_frames_missing: int = 20,
                  min_session_duration: float = 0.5,
-                 fps: float = 30.0):
+                 fps: float = 30.0,
+                 max_gaze_history: Optional[int] = None):
         self.next_id = 0 # Next unique ID to assign
         self.active_faces: Dict[int, TrackedFace] = {} # id -> TrackedFace
+        self._active_faces_view = MappingProxyType(self.active_faces)
         self.completed_sessions: List[TrackingSession] = [] 
+        self._completed_sessions_view: Optional[Tuple[TrackingSession, ...]] = () # rebuilt lazily after a session completes
         self.iou_threshold = iou_threshold
         self.max_frames_missing = max_frames_missing
         self.min_session_duration = min_session_duration
         self.fps = fps
-        self._session_callbacks = []
+        self.max_gaze_history = max_gaze_history # per-face record cap, None = keep all
+        self._session_callbacks: Tuple = () # copy-on-write, safe to iterate while callbacks are added
         
     def add_session_callback(self, callback):
         """Add callback to be called when a session is completed."""
-        self._session_callbacks.append(callback) # function should accept a TrackingSession object
+        self._session_callbacks = self._session_callbacks + (callback,) # function should accept a TrackingSession object
         
     def calculate_iou(self, box1: Tuple[int, int, int, int], 
                       box2: Tuple[int, int, int, int]) -> float:
@@ -132,38 +305,83 @@ class FaceTracker(ITracker):
         for face_id in self.active_faces:
             self.active_faces[face_id].missing_frames += 1
         
-        # Match detected faces to existing tracked faces
+        # One timestamp per frame, shared by every record made in this update
+        timestamp = frame_count / self.fps
+        
+        # Match detected faces to existing tracked faces, scoring every
+        # detection/face pair in one vectorized IoU computation
+        face_ids = list(self.active_faces.keys())
+        iou_matrix = self.calculate_iou_matrix(
+            [detection.box for detection in detected_faces],
+            [self.active_faces[face_id].box for face_id in face_ids]
+        )
+        
         matched: Set[int] = set()
-        for detection in detected_faces:
-            best_match_id = self._find_best_match(detection, matched)
+        new_face_ids: List[int] = []
+        for i, detection in enumerate(detected_faces):
+            best_match_id = self._find_best_match(detection, iou_matrix[i], face_ids,
+                                                  new_face_ids, matched)
             
             if best_match_id is not None:
                 matched.add(best_match_id)
-                self._update_face(best_match_id, detection, frame_count)
+                self._update_face(best_match_id, detection, frame_count, timestamp)
             else:
-                self._create_new_face(detection, frame_count)
+                new_face_ids.append(self._create_new_face(detection, frame_count, timestamp))
         
         # Check for faces that have left the frame
         self._remove_lost_faces()
     
-    def _find_best_match(self, detection: FaceDetection, 
-                        matched: Set[int]) -> Optional[int]:
-        """Find the best matching existing face for a detection."""
+    def calculate_iou_matrix(self, boxes1: List[Tuple[int, int, int, int]],
+                             boxes2: List[Tuple[int, int, int, int]]) -> np.ndarray:
+        """Calculate pairwise IoU between two lists of boxes as a (len1, len2) matrix."""
+        if not boxes1 or not boxes2:
+            return np.zeros((len(boxes1), len(boxes2)))
+        
+        a = np.asarray(boxes1, dtype=np.int64)
+        b = np.asarray(boxes2, dtype=np.int64)
+        
+        # Intersection of every pair via broadcasting
+        x_left = np.maximum(a[:, None, 0], b[None, :, 0])
+        y_top = np.maximum(a[:, None, 1], b[None, :, 1])
+        x_right = np.minimum(a[:, None, 0] + a[:, None, 2], b[None, :, 0] + b[None, :, 2])
+        y_bottom = np.minimum(a[:, None, 1] + a[:, None, 3], b[None, :, 1] + b[None, :, 3])
+        intersection_area = np.clip(x_right - x_left, 0, None) * np.clip(y_bottom - y_top, 0, None)
+        
+        union_area = (a[:, 2] * a[:, 3])[:, None] + (b[:, 2] * b[:, 3])[None, :] - intersection_area
+        return np.where(union_area > 0,
+                        intersection_area / np.where(union_area > 0, union_area, 1), 0.0)
+    
+    def _find_best_match(self, detection: FaceDetection, ious: np.ndarray,
+                         face_ids: List[int], new_face_ids: List[int],
+                         matched: Set[int]) -> Optional[int]:
+        """Find the best matching face for a detection from its row of the IoU matrix."""
         best_match_id = None
         best_iou = 0
         
-        for face_id, face_data in self.active_faces.items():
+        # Faces tracked before this frame
+        if len(face_ids) > 0:
+            candidates = ious.copy()
+            if matched:
+                candidates[[j for j, face_id in enumerate(face_ids) if face_id in matched]] = -1.0
+            j = int(np.argmax(candidates))
+            if candidates[j] > best_iou and candidates[j] > self.iou_threshold:
+                best_iou = candidates[j]
+                best_match_id = face_ids[j]
+        
+        # Faces created earlier in this frame are not in the matrix
+        for face_id in new_face_ids:
             if face_id in matched:
                 continue
-                
-            iou = self.calculate_iou(detection.box, face_data.box)
+            
+            iou = self.calculate_iou(detection.box, self.active_faces[face_id].box)
             if iou > best_iou and iou > self.iou_threshold:
                 best_iou = iou
                 best_match_id = face_id
         
         return best_match_id
     
-    def _create_new_face(self, detection: FaceDetection, frame_count: int) -> None:
+    def _create_new_face(self, detection: FaceDetection, frame_count: int,
+                         timestamp: float) -> int:
         """Create a new tracked face."""
         face_id = self.next_id
         self.next_id += 1
@@ -173,16 +391,21 @@ class FaceTracker(ITracker):
             box=detection.box,
             first_seen=frame_count,
             last_seen=frame_count,
+            gaze_history=GazeHistory(max_length=self.max_gaze_history),
             current_zone=detection.zone,
             zone_start_frame=frame_count,
-            confidence=detection.confidence
+            confidence=detection.confidence,
+            landmarks=detection.landmarks,
+            yaw=detection.yaw,
+            pitch=detection.pitch
         )
         
         self.active_faces[face_id] = tracked_face
-        self._add_gaze_record(face_id, detection, frame_count)
+        self._add_gaze_record(face_id, detection, frame_count, timestamp)
+        return face_id
     
     def _update_face(self, face_id: int, detection: FaceDetection, 
-                     frame_count: int) -> None:
+                     frame_count: int, timestamp: float) -> None:
         """Update existing tracked face."""
         face_data = self.active_faces[face_id]
         
@@ -201,23 +424,33 @@ class FaceTracker(ITracker):
         face_data.last_seen = frame_count
         face_data.missing_frames = 0
         face_data.confidence = detection.confidence
+        face_data.landmarks = detection.landmarks
+        face_data.yaw = detection.yaw
+        face_data.pitch = detection.pitch
+        face_data.frames_since_mesh = face_data.frames_since_mesh + 1 if detection.mesh_cached else 0
         
         # Add gaze record
-        self._add_gaze_record(face_id, detection, frame_count)
+        self._add_gaze_record(face_id, detection, frame_count, timestamp)
     
     def _add_gaze_record(self, face_id: int, detection: FaceDetection, 
-                         frame_count: int) -> None:
+                         frame_count: int, timestamp: float) -> None:
         """Add a gaze record to face history."""
-        gaze_record = GazeRecord(
+        face_data = self.active_faces[face_id]
+        # Zone names are rebuilt per frame (e.g. with a "_Basic" suffix); interning
+        # makes every record share one string per zone
+        zone = sys.intern(detection.zone)
+        face_data.gaze_history.append(
             frame=frame_count,
-            zone=detection.zone,
+            zone=zone,
             yaw=detection.yaw,
             pitch=detection.pitch,
             position=detection.face_center or (0, 0),
             confidence=detection.confidence,
-            timestamp=frame_count / self.fps
+            timestamp=timestamp
         )
-        self.active_faces[face_id].gaze_history.append(gaze_record)
+        face_data.unique_zones.add(zone)
+        face_data.confidence_sum += detection.confidence
+        face_data.confidence_count += 1
     
     def _remove_lost_faces(self) -> None:
         """Remove faces that have been missing for too long."""
@@ -247,13 +480,8 @@ class FaceTracker(ITracker):
         if total_duration < self.min_session_duration or len(face_data.gaze_history) < 2:
             return
         
-        # Calculate zone transitions
-        zone_transitions = self._calculate_zone_transitions(face_data.gaze_history)
-        
         # Identify peak interest zones (top 3 by duration)
-        sorted_zones = sorted(face_data.zone_durations.items(), 
-                            key=lambda x: x[1], reverse=True)
-        peak_zones = sorted_zones[:3]
+        peak_zones = nlargest(3, face_data.zone_durations.items(), key=itemgetter(1))
         
         # Create session summary
         session = TrackingSession(
@@ -263,36 +491,32 @@ class FaceTracker(ITracker):
             total_duration=total_duration,
             zone_durations=dict(face_data.zone_durations),
             gaze_history=face_data.gaze_history,
-            unique_zones_visited=list(set(g.zone for g in face_data.gaze_history)),
-            avg_confidence=np.mean([g.confidence for g in face_data.gaze_history]),
-            total_zone_transitions=len(zone_transitions),
+            unique_zones_visited=list(face_data.unique_zones),
+            avg_confidence=face_data.confidence_sum / max(1, face_data.confidence_count),
+            total_zone_transitions=face_data.gaze_history.zone_transitions,
             peak_interest_zones=peak_zones
         )
         
         self.completed_sessions.append(session)
+        self._completed_sessions_view = None
         
         # Notify callbacks
         for callback in self._session_callbacks:
             callback(session)
     
-    def _calculate_zone_transitions(self, gaze_history: List[GazeRecord]) -> List[Tuple[str, str]]:
-        """Calculate zone transitions from gaze history."""
-        transitions = []
-        for i in range(1, len(gaze_history)):
-            if gaze_history[i].zone != gaze_history[i-1].zone:
-                transitions.append((
-                    gaze_history[i-1].zone,
-                    gaze_history[i].zone
-                ))
-        return transitions
-    
-    def get_active_faces(self) -> Dict[int, TrackedFace]:
-        """Get currently tracked faces."""
-        return self.active_faces.copy()
+    def get_active_faces(self) -> Mapping[int, TrackedFace]:
+        """Get currently tracked faces as a read-only live view."""
+        return self._active_faces_view
     
-    def get_completed_sessions(self) -> List[TrackingSession]:
+    def get_completed_sessions(self) -> Tuple[TrackingSession, ...]:
         """Get completed tracking sessions."""
-        return self.completed_sessions.copy()
+        if self._completed_sessions_view is None:
+            self._completed_sessions_view = tuple(self.completed_sessions)
+        return self._completed_sessions_view
+    
+    def get_completed_count(self) -> int:
+        """Get the number of completed tracking sessions."""
+        return len(self.completed_sessions)
     
     def finalize_all_sessions(self) -> None:
         """Finalize all remaining active faces."""
@@ -2,22 +2,28 @@ import cv2
 import mediapipe as mp
 
 import numpy as np
-from typing import List, Optional, Dict, Any
+from typing import Iterator, List, Mapping, Optional, Dict, Any, Tuple
 from pathlib import Path
 import argparse
 import logging
 from datetime import datetime
 import json
+import copy
 import sys
+import time
 
 # our modules
 from face_tracker.face_tracker import FaceTracker, FaceDetection, TrackedFace
 from head_pose_estimator.head_pose_estimator import HeadPoseEstimatorFactory, HeadPose
 from zone_mapper.zone_mapper import ZoneMapperFactory, GazeContext
 from analytics_writer.analytics_writer import (
-    ConsoleAnalyticsWriter, JSONAnalyticsWriter,
+    ConsoleAnalyticsWriter, JSONAnalyticsWriter, AsyncAnalyticsWriter,
     CompositeAnalyticsWriter, AnalyticsProcessor, AggregateAnalytics
 )
+from video_io.video_io import PipelineExecutor, ThreadedFrameReader, ThreadedVideoWriter, open_capture
+
+
+logger = logging.getLogger(__name__)
 
 
 class GazeTrackingSystem:
@@ -27,12 +33,24 @@ class GazeTrackingSystem:
         self.config = config
         self.logger = self._setup_logging()
         
+        # Capture, analytics and MediaPipe already run their own threads, so OpenCV's
+        # per-core pool can oversubscribe the CPU. Capping it is process-wide, so it
+        # only happens when opencv_threads is set explicitly (None = OpenCV default).
+        opencv_threads = config.get('opencv_threads')
+        if opencv_threads is not None:
+            cv2.setNumThreads(opencv_threads)
+        
+        # Nominal frame rate, used for durations both in tracking and on screen
+        self._fps = float(config.get('fps', 30.0))
+        self._inv_fps = 1.0 / self._fps
+        
         # Initialize components
         self.face_tracker = FaceTracker(
             iou_threshold=config.get('iou_threshold', 0.3), #fetches value from config dict, if not found uses default 0.3
             max_frames_missing=config.get('max_frames_missing', 5),
             min_session_duration=config.get('min_session_duration', 0.5),
-            fps=config.get('fps', 30.0)
+            fps=self._fps,
+            max_gaze_history=config.get('max_gaze_history')
         )
         
         self.head_pose_estimator = HeadPoseEstimatorFactory.create_estimator(
@@ -43,6 +61,8 @@ class GazeTrackingSystem:
             config.get('zone_mapper', 'bakery'),
             config.get('zone_config_path')
         )
+        # Zone lookup for drawing; reversed so the first zone wins on duplicate names
+        self._zones_by_name = {zone.name: zone for zone in reversed(self.zone_mapper.get_zones())}
         
         # Initialize analytics writers
         self.analytics_writer = self._setup_analytics_writers(config)
@@ -66,14 +86,68 @@ class GazeTrackingSystem:
             max_num_faces=1,
             refine_landmarks=False,
             min_detection_confidence=config.get('mesh_confidence', 0.3),
-            min_tracking_confidence=0.5
+            min_tracking_confidence=config.get('mesh_tracking_confidence', 0.5)
         )
+        # Margin around the detected box given to FaceMesh, as a fraction of its smaller side
+        self.mesh_padding = config.get('mesh_padding', 0.3)
         
         # Processing parameters
         self.frame_skip = config.get('frame_skip', 1)
         self.display_output = config.get('display_output', True)
         self.save_output = config.get('save_output', False)
         self.output_path = config.get('output_path', 'output.mp4')
+        self.frame_queue_size = config.get('frame_queue_size', 8)
+        self.drop_stale_frames = config.get('drop_stale_frames', True)
+        self.camera_fourcc = config.get('camera_fourcc', 'MJPG')
+        # Failed camera reads in a row before a live stream counts as ended
+        self.max_consecutive_failures = config.get('max_consecutive_failures', 30)
+        self.hw_decode = config.get('hw_decode', True)
+        # Run face detection on its own thread, one frame ahead of FaceMesh/tracking
+        self.pipeline_detection = config.get('pipeline_detection', False)
+        self._rgb_buffer: Optional[np.ndarray] = None  # reused BGR->RGB conversion target
+        
+        # Optional cap on the longer side of the face detection input (None = full size)
+        self.detect_max_dim = config.get('detect_max_dim')
+        self._detect_buffer: Optional[np.ndarray] = None  # reused resize target
+        
+        # FaceMesh reuse: a face whose box overlaps its last one by more than
+        # mesh_cache_iou keeps its pose for up to mesh_cache_frames frames (0 = off,
+        # the default: reuse trades some zone accuracy for speed)
+        self.mesh_cache_iou = config.get('mesh_cache_iou', 0.9)
+        self.mesh_cache_frames = config.get('mesh_cache_frames', 0)
+        
+        # Motion gate: when a frame barely differs from the last fully analysed
+        # one, reuse its detections (None = always analyse). A full pass is still
+        # forced every motion_refresh_frames processed frames.
+        self.motion_threshold = config.get('motion_threshold')
+        self.motion_refresh_frames = config.get('motion_refresh_frames', 30)
+        self._motion_reference: Optional[np.ndarray] = None  # small gray copy of the last analysed frame
+        self._last_detections: List[FaceDetection] = []
+        self._frames_since_analysis = 0
+        
+        # Cap on how often frames are drawn and shown (None = every frame); only
+        # affects the display, saved output still gets every frame
+        self.display_fps = config.get('display_fps')
+        self._display_interval = 1.0 / self.display_fps if self.display_fps else 0.0
+        self._last_display_time = 0.0
+        
+        # Zone boundary overlay, rendered once per frame shape
+        self._zone_overlay: List[Tuple] = []
+        self._zone_overlay_shape: Optional[Tuple[int, ...]] = None
+        self._status_bar: Optional[np.ndarray] = None
+        self._status_bar_shape: Optional[Tuple[int, ...]] = None
+        
+        # Status bar FPS: tick count of the previous rendered frame (0 = none yet)
+        self._last_frame_time = 0
+        self._tick_freq = cv2.getTickFrequency()
+        
+        # Processing metrics
+        self.metrics = {
+            'frames_captured': 0,
+            'frames_processed': 0,
+            'process_seconds_total': 0.0,
+            'process_seconds_max': 0.0
+        }
     
     def _setup_logging(self) -> logging.Logger:
         """Setup logging configuration."""
@@ -94,30 +168,42 @@ class GazeTrackingSystem:
             ))
         
         if config.get('database_output', False):
-            print("Database output enabled")
+            self.logger.info("Database output enabled")
         
         if config.get('json_output', False):
             writers.append(JSONAnalyticsWriter(
-                output_dir=config.get('json_output_dir', 'analytics_output')
+                output_dir=config.get('json_output_dir', 'analytics_output'),
+                indent=config.get('json_indent', 2),
+                json_format=config.get('json_format', 'files')
             ))
         
         if len(writers) == 0:
             # Default to console output
-            return ConsoleAnalyticsWriter()
+            writer = ConsoleAnalyticsWriter()
         elif len(writers) == 1:
-            return writers[0]
+            writer = writers[0]
         else:
-            return CompositeAnalyticsWriter(writers)
+            writer = CompositeAnalyticsWriter(writers)
+        
+        # Keep session I/O off the frame processing loop
+        if config.get('async_analytics', True):
+            writer = AsyncAnalyticsWriter(writer)
+        
+        return writer
     
     def process_video(self, video_path: str) -> None: #calls _detect_faces and _visualize_frame and _finalize_tracking from GazeTrackingSystem
         """Process video file for gaze tracking."""
         self.logger.info(f"Processing video: {video_path}")
         
-        cap = cv2.VideoCapture(video_path)
+        cap = open_capture(video_path, hw_acceleration=self.hw_decode)
         if not cap.isOpened():
             self.logger.error(f"Failed to open video: {video_path}")
             return
         
+        if self.hw_decode:
+            hw_mode = int(cap.get(cv2.CAP_PROP_HW_ACCELERATION))
+            self.logger.info(f"Hardware decode: {'enabled' if hw_mode > 0 else 'unavailable, using software'}")
+        
         # Get video properties
         fps = cap.get(cv2.CAP_PROP_FPS)
         frame_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
@@ -126,34 +212,33 @@ class GazeTrackingSystem:
         
         self.logger.info(f"Video properties: {frame_width}x{frame_height} @ {fps}fps, {total_frames} frames")
         
-        # Setup video writer if saving output
+        # Setup video writer if saving output; encoding runs on its own thread
         out = None
         if self.save_output:
             fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-            out = cv2.VideoWriter(self.output_path, fourcc, fps, 
-                                (frame_width, frame_height))
+            out = ThreadedVideoWriter(
+                cv2.VideoWriter(self.output_path, fourcc, fps, (frame_width, frame_height)),
+                queue_size=self.frame_queue_size
+            ).start()
             self.logger.info(f"Saving output to: {self.output_path}")
         
-        frame_count = 0
+        render_output = self.display_output or self.save_output
+        frames = self._iter_video_frames(cap, render_output)
         
         try:
-            while cap.isOpened():
-                success, frame = cap.read()
-                if not success:
-                    break
-                
-                frame_count += 1
-                
+            for frame_count, frame, face_boxes in frames:
                 # Process frame
                 if frame_count % self.frame_skip == 0:
-                    detected_faces = self._detect_faces(frame)
-                    self.face_tracker.update(detected_faces, frame_count)
+                    self._process_frame(frame, frame_count, face_boxes)
                 
-                # Visualize results
-                if self.display_output or self.save_output:
-                    visualization = self._visualize_frame(frame, frame_count)
+                # Visualize results. The writer thread encodes later, after the reader
+                # has reused this frame's buffer, so saved frames are drawn on a copy
+                show_frame = self.display_output and self._display_due()
+                if show_frame or self.save_output:
+                    visualization = self._visualize_frame(frame, frame_count, 
+                                                          inplace=not self.save_output)
                     
-                    if self.display_output:
+                    if show_frame:
                         cv2.imshow("Gaze Tracking System", visualization)
                         key = cv2.waitKey(1) & 0xFF
                         if key == ord('q'):
@@ -171,28 +256,153 @@ class GazeTrackingSystem:
                 
                 # Log progress
                 if frame_count % 100 == 0:
+                    # %-style arguments: formatting is skipped when INFO is disabled
                     progress = (frame_count / total_frames) * 100
-                    self.logger.info(f"Processed {frame_count}/{total_frames} frames ({progress:.1f}%)")
+                    self.logger.info("Processed %d/%d frames (%.1f%%)", frame_count, total_frames, progress)
         
         except Exception as e:
             self.logger.error(f"Error processing video: {e}")
             raise
         
         finally:
-            # Cleanup
+            # Cleanup (closing the frame iterator stops the reader threads first)
+            frames.close()
             cap.release()
-            if out:
-                out.release()
-            cv2.destroyAllWindows()
-            
-            # Finalize tracking
-            self._finalize_tracking()
+            try:
+                # Re-raises any encoder error from the writer thread
+                if out:
+                    out.release()
+            finally:
+                cv2.destroyAllWindows()
+                
+                # Finalize tracking
+                self._finalize_tracking()
+    
+    def _iter_video_frames(self, cap: cv2.VideoCapture, 
+                           render_output: bool) -> Iterator[Tuple[int, np.ndarray, Optional[list]]]:
+        """Yield (frame_count, frame, face_boxes) for every frame that will be used.
+        
+        face_boxes is None unless detection already ran on the pipeline thread.
+        """
+        # Decoding runs on a reader thread (back-pressured, nothing dropped); frames
+        # that are neither analysed nor shown are grabbed without decoding
+        reader = ThreadedFrameReader(
+            cap, queue_size=self.frame_queue_size, drop_oldest=False,
+            frame_filter=None if render_output else (lambda n: n % self.frame_skip == 0)
+        )
+        
+        if self.pipeline_detection:
+            # Capture thread -> detection thread -> this thread (FaceMesh, tracking, output).
+            # Detection only touches face_detection and its own buffers; everything
+            # stateful stays on this thread.
+            source = PipelineExecutor(
+                reader,
+                lambda n, frame: self._locate_faces(frame) if n % self.frame_skip == 0 else None,
+                queue_size=4
+            ).start()
+        else:
+            source = reader.start()
+        
+        last_frame = 0
+        try:
+            while True:
+                item = source.read()
+                if item is None:
+                    # Count trailing frames that were grabbed but filtered out
+                    self.metrics['frames_captured'] += reader.frames_grabbed - last_frame
+                    return
+                
+                if self.pipeline_detection:
+                    frame_count, frame, face_boxes = item
+                else:
+                    (frame_count, frame), face_boxes = item, None
+                self.metrics['frames_captured'] += frame_count - last_frame
+                last_frame = frame_count
+                yield frame_count, frame, face_boxes
+                source.release(frame)
+        finally:
+            source.stop()
+    
+    def _process_frame(self, frame: np.ndarray, frame_count: int,
+                       face_boxes: Optional[List[Tuple[int, int, int, int, float]]] = None) -> None:
+        """Detect faces in a frame and feed them to the tracker."""
+        start = time.perf_counter()
+        
+        detected_faces = self._detect_faces(frame, face_boxes)
+        self.face_tracker.update(detected_faces, frame_count)
+        
+        elapsed = time.perf_counter() - start
+        self.metrics['frames_processed'] += 1
+        self.metrics['process_seconds_total'] += elapsed
+        self.metrics['process_seconds_max'] = max(self.metrics['process_seconds_max'], elapsed)
     
-    def _detect_faces(self, frame: np.ndarray) -> List[FaceDetection]:
-        """Detect faces and estimate gaze in frame."""
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get processing throughput and tracking metrics."""
+        processed = self.metrics['frames_processed']
+        return {
+            **self.metrics,
+            'avg_process_ms': (self.metrics['process_seconds_total'] / processed * 1000 
+                               if processed > 0 else 0.0),
+            'active_faces': len(self.face_tracker.get_active_faces()),
+            'completed_sessions': self.face_tracker.get_completed_count()
+        }
+    
+    def _detect_faces(self, frame: np.ndarray,
+                      face_boxes: Optional[List[Tuple[int, int, int, int, float]]] = None) -> List[FaceDetection]:
+        """Detect faces (unless face_boxes is given) and estimate gaze in frame."""
+        if self.motion_threshold is not None:
+            if self._is_static_frame(frame):
+                self._frames_since_analysis += 1
+                return self._last_detections
+            self._frames_since_analysis = 0
+        
         detected_faces = []
+        if face_boxes is None:
+            face_boxes = self._locate_faces(frame)
+        
+        # Tracked faces as of the previous frame, for reusing FaceMesh poses
+        tracked_faces = self.face_tracker.get_active_faces() if self.mesh_cache_frames > 0 else None
+        
+        for x, y, w, h, score in face_boxes:
+            # Process face for gaze estimation
+            face_detection = self._process_face(frame, x, y, w, h, score, tracked_faces)
+            if face_detection:
+                detected_faces.append(face_detection)
+        
+        self._last_detections = detected_faces
+        return detected_faces
+    
+    def _is_static_frame(self, frame: np.ndarray) -> bool:
+        """Check whether a frame is close enough to the last analysed one to reuse its detections."""
+        small = cv2.cvtColor(cv2.resize(frame, (80, 60), interpolation=cv2.INTER_AREA), 
+                             cv2.COLOR_BGR2GRAY)
+        reference = self._motion_reference
+        if (reference is not None 
+                and self._frames_since_analysis + 1 < self.motion_refresh_frames
+                and cv2.absdiff(small, reference).mean() < self.motion_threshold):
+            return True
+        
+        # Compare against the last analysed frame, not the previous one, so slow
+        # drift still triggers a new pass
+        self._motion_reference = small
+        return False
+    
+    def _locate_faces(self, frame: np.ndarray) -> List[Tuple[int, int, int, int, float]]:
+        """Run face detection and return (x, y, w, h, score) boxes in frame pixels."""
+        face_boxes = []
         frame_height, frame_width = frame.shape[:2]
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        
+        # The detector resizes to its own small input anyway, so hand it a
+        # downscaled copy; its boxes are relative and map straight back
+        detect_frame = self._downscale_for_detection(frame)
+        
+        # Convert into a persistent buffer rather than allocating a frame per call
+        if self._rgb_buffer is None or self._rgb_buffer.shape != detect_frame.shape:
+            self._rgb_buffer = np.empty_like(detect_frame)
+        self._rgb_buffer.flags.writeable = True
+        rgb_frame = cv2.cvtColor(detect_frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buffer)
+        # Read-only input lets MediaPipe wrap the buffer instead of copying it
+        rgb_frame.flags.writeable = False
         
         # Detect faces
         detection_results = self.face_detection.process(rgb_frame)
@@ -213,23 +423,34 @@ class GazeTrackingSystem:
                 h = min(h, frame_height - y)
                 
                 if w > 30 and h > 30:  # Minimum face size
-                    # Process face for gaze estimation
-                    face_detection = self._process_face(
-                        rgb_frame, x, y, w, h, 
-                        detection.score[0] if detection.score else 0.5
-                    )
-                    if face_detection:
-                        detected_faces.append(face_detection)
+                    face_boxes.append((x, y, w, h, detection.score[0] if detection.score else 0.5))
         
-        return detected_faces
+        return face_boxes
+    
+    def _downscale_for_detection(self, frame: np.ndarray) -> np.ndarray:
+        """Shrink a frame so its longer side is at most detect_max_dim pixels."""
+        frame_height, frame_width = frame.shape[:2]
+        longest_side = max(frame_height, frame_width)
+        if not self.detect_max_dim or longest_side <= self.detect_max_dim:
+            return frame
+        
+        # Power-of-two factors keep INTER_AREA on its fast block-averaging path
+        factor = 2
+        while longest_side // factor > self.detect_max_dim:
+            factor *= 2
+        size = (max(1, frame_width // factor), max(1, frame_height // factor))
+        if self._detect_buffer is None or self._detect_buffer.shape[:2] != (size[1], size[0]):
+            self._detect_buffer = np.empty((size[1], size[0]) + frame.shape[2:], dtype=frame.dtype)
+        return cv2.resize(frame, size, dst=self._detect_buffer, interpolation=cv2.INTER_AREA)
     
     def _process_face(self, frame: np.ndarray, x: int, y: int, 
-                     w: int, h: int, confidence: float) -> Optional[FaceDetection]:
-        """Process individual face for gaze estimation."""
+                     w: int, h: int, confidence: float,
+                     tracked_faces: Optional[Mapping[int, TrackedFace]] = None) -> Optional[FaceDetection]:
+        """Process individual face for gaze estimation on the full-resolution BGR frame."""
         frame_height, frame_width = frame.shape[:2]
         
         # Add padding for better FaceMesh results
-        padding = int(min(w, h) * 0.3)
+        padding = int(min(w, h) * self.mesh_padding)
         x_pad = max(0, x - padding)
         y_pad = max(0, y - padding)
         w_pad = min(frame_width - x_pad, w + 2*padding)
@@ -239,76 +460,97 @@ class GazeTrackingSystem:
         face_crop = frame[y_pad:y_pad+h_pad, x_pad:x_pad+w_pad]
         
         if face_crop.size > 0 and face_crop.shape[0] > 20 and face_crop.shape[1] > 20: 
-            # Apply FaceMesh
-            mesh_results = self.face_mesh.process(face_crop)
-            
-            if mesh_results.multi_face_landmarks:
-                landmarks = mesh_results.multi_face_landmarks[0]
-                
-                # Estimate head pose
-                head_pose = self.head_pose_estimator.estimate_pose(
-                    landmarks, face_crop.shape
-                )
-                
-                # Map to zone
-                face_center_x = x + w // 2
-                face_center_y = y + h // 2
-                
-                gaze_context = GazeContext(
-                    yaw_angle=head_pose.yaw,
-                    pitch_angle=head_pose.pitch,
-                    face_center_x=face_center_x,
-                    face_center_y=face_center_y,
-                    frame_width=frame_width,
-                    frame_height=frame_height,
-                    confidence=confidence
-                )
-                
-                zone = self.zone_mapper.map_to_zone(gaze_context)
-                
-                return FaceDetection(
-                    box=(x, y, w, h),
-                    crop_box=(x_pad, y_pad, w_pad, h_pad),
-                    landmarks=landmarks,
-                    yaw=head_pose.yaw,
-                    pitch=head_pose.pitch,
-                    zone=zone,
-                    confidence=confidence,
-                    face_center=(face_center_x, face_center_y)
-                )
+            cached_face = self._find_cached_pose((x, y, w, h), tracked_faces)
+            if cached_face is not None:
+                # Face has barely moved since FaceMesh last ran on it; reuse that pose
+                landmarks = cached_face.landmarks
+                yaw, pitch = cached_face.yaw, cached_face.pitch
             else:
-                # Fallback without detailed pose
-                face_center_x = x + w // 2
-                face_center_y = y + h // 2
-                
-                gaze_context = GazeContext(
-                    yaw_angle=0,
-                    pitch_angle=0,
-                    face_center_x=face_center_x,
-                    face_center_y=face_center_y,
-                    frame_width=frame_width,
-                    frame_height=frame_height,
-                    confidence=confidence
-                )
+                # Apply FaceMesh; only the crop needs converting to RGB
+                rgb_crop = cv2.cvtColor(face_crop, cv2.COLOR_BGR2RGB)
+                rgb_crop.flags.writeable = False
+                mesh_results = self.face_mesh.process(rgb_crop)
+                landmarks = (mesh_results.multi_face_landmarks[0] 
+                             if mesh_results.multi_face_landmarks else None)
                 
-                zone = self.zone_mapper.map_to_zone(gaze_context)
-                
-                return FaceDetection(
-                    box=(x, y, w, h),
-                    crop_box=(x_pad, y_pad, w_pad, h_pad),
-                    landmarks=None,
-                    yaw=0,
-                    pitch=0,
-                    zone=zone + "_Basic",
-                    confidence=confidence,
-                    face_center=(face_center_x, face_center_y)
-                )
+                if landmarks is not None:
+                    # Estimate head pose
+                    head_pose = self.head_pose_estimator.estimate_pose(
+                        landmarks, face_crop.shape
+                    )
+                    yaw, pitch = head_pose.yaw, head_pose.pitch
+                else:
+                    # Fallback without detailed pose
+                    yaw, pitch = 0, 0
+            
+            # Map to zone
+            face_center_x = x + w // 2
+            face_center_y = y + h // 2
+            
+            gaze_context = GazeContext(
+                yaw_angle=yaw,
+                pitch_angle=pitch,
+                face_center_x=face_center_x,
+                face_center_y=face_center_y,
+                frame_width=frame_width,
+                frame_height=frame_height,
+                confidence=confidence
+            )
+            
+            zone = self.zone_mapper.map_to_zone(gaze_context)
+            if landmarks is None:
+                zone += "_Basic"
+            
+            return FaceDetection(
+                box=(x, y, w, h),
+                crop_box=(x_pad, y_pad, w_pad, h_pad),
+                landmarks=landmarks,
+                yaw=yaw,
+                pitch=pitch,
+                zone=zone,
+                confidence=confidence,
+                face_center=(face_center_x, face_center_y),
+                mesh_cached=cached_face is not None
+            )
         
         return None
     
-    def _visualize_frame(self, frame: np.ndarray, frame_count: int) -> np.ndarray: #calls _draw_face, _draw_zone_boundaries, and _draw_status from GazeTrackingSystem
-        """Visualize tracking results on frame."""
-        vis_frame = frame.copy()
+    def _find_cached_pose(self, box: tuple, 
+                          tracked_faces: Optional[Mapping[int, TrackedFace]]) -> Optional[TrackedFace]:
+        """Find a tracked face whose last FaceMesh pose can stand in for this box."""
+        if not tracked_faces or self.mesh_cache_frames <= 0:
+            return None
+        
+        best_face = None
+        best_iou = self.mesh_cache_iou
+        for face_data in tracked_faces.values():
+            # Only faces seen last frame, with real landmarks, not reused for too long
+            if (face_data.landmarks is None or face_data.missing_frames > 0 
+                    or face_data.frames_since_mesh >= self.mesh_cache_frames):
+                continue
+            
+            iou = self.face_tracker.calculate_iou(box, face_data.box)
+            if iou > best_iou:
+                best_iou = iou
+                best_face = face_data
+        
+        return best_face
+    
+    def _display_due(self) -> bool:
+        """Check whether the next frame should be shown, given display_fps."""
+        if not self._display_interval:
+            return True
+        
+        now = time.monotonic()
+        if now - self._last_display_time < self._display_interval:
+            return False
+        self._last_display_time = now
+        return True
+    
+    def _visualize_frame(self, frame: np.ndarray, frame_count: int, 
+                         inplace: bool = False) -> np.ndarray: #calls _draw_face, _draw_zone_boundaries, and _draw_status from GazeTrackingSystem
+        """Visualize tracking results on frame (drawing on frame itself if inplace)."""
+        vis_frame = frame if inplace else frame.copy()
         frame_height, frame_width = frame.shape[:2]
         
         # Get active faces
@@ -320,7 +562,7 @@ class GazeTrackingSystem:
             self._draw_face(vis_frame, face_id, face_data, frame_count)
             # draw zone boundaries
             if face_data.current_zone:
-                zone = self.zone_mapper.get_zone_by_name(face_data.current_zone)
+                zone = self._zones_by_name.get(face_data.current_zone)
                 if zone and zone.bounds:
                     x1, y1, x2, y2 = zone.bounds
                     cv2.rectangle(vis_frame, (x1, y1), (x2, y2), zone.color, 2)
@@ -336,7 +578,7 @@ class GazeTrackingSystem:
         
         # Draw status information
         self._draw_status(vis_frame, frame_count, len(active_faces), 
-                         len(self.face_tracker.get_completed_sessions()))
+                         self.face_tracker.get_completed_count())
         
         return vis_frame
     
@@ -346,7 +588,7 @@ class GazeTrackingSystem:
         x, y, w, h = face_data.box
         
         # Get zone color
-        zone = self.zone_mapper.get_zone_by_name(face_data.current_zone)
+        zone = self._zones_by_name.get(face_data.current_zone)
         color = zone.color if zone else (0, 255, 0)
         
         # Draw bounding box
@@ -377,8 +619,8 @@ class GazeTrackingSystem:
         info_lines = [
             f"ID: {face_id}",
             f"Zone: {face_data.current_zone[:25]}",  # Truncate long zone names
-            f"Duration: {(frame_count - face_data.first_seen) / self.config.get('fps', 30.0):.1f}s",
-            f"Zones visited: {len(set(g.zone for g in face_data.gaze_history))}",
+            f"Duration: {(frame_count - face_data.first_seen) * self._inv_fps:.1f}s",
+            f"Zones visited: {len(face_data.unique_zones)}",
             f"Conf: {face_data.confidence:.2f}"
         ]
         
@@ -390,17 +632,30 @@ class GazeTrackingSystem:
     
     def _draw_zone_boundaries(self, frame: np.ndarray) -> None:
         """Draw zone boundaries on frame."""
-        frame_height, frame_width = frame.shape[:2]
+        # The divider and labels only depend on the frame size: render them once
+        # and afterwards copy just their pixels onto each frame
+        if self._zone_overlay_shape != frame.shape:
+            self._zone_overlay = self._render_zone_overlay(frame.shape)
+            self._zone_overlay_shape = frame.shape
+        
+        for y0, y1, x0, x1, pixels, mask in self._zone_overlay:
+            cv2.copyTo(pixels, mask, frame[y0:y1, x0:x1])
+    
+    def _render_zone_overlay(self, shape: Tuple[int, ...]) -> List[Tuple]:
+        """Render zone boundaries as (y0, y1, x0, x1, pixels, mask) patches."""
+        frame_height, frame_width = shape[:2]
+        canvas = np.zeros(shape, dtype=np.uint8)
+        regions = []
         
         # Draw vertical divisions
         third_width = (frame_width // 5)*2
-        cv2.line(frame, (third_width, 0), (third_width, frame_height), 
+        cv2.line(canvas, (third_width, 0), (third_width, frame_height), 
                 (255, 255, 255), 1)
+        regions.append((0, frame_height, third_width, third_width + 1))
         # cv2.line(frame, (2*third_width, 0), (2*third_width, frame_height), 
         #         (255, 255, 255), 1)
         
         # Draw zone labels
-        zones = self.zone_mapper.get_zones()
         label_y = frame_height - 20
         
         # Ensure we have zones to display
@@ -411,34 +666,63 @@ class GazeTrackingSystem:
         ]
         
         for label, color, x_pos in zone_labels:
-            cv2.putText(frame, label, (x_pos, label_y), 
+            cv2.putText(canvas, label, (x_pos, label_y), 
                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+            (text_width, text_height), baseline = cv2.getTextSize(
+                label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 2)
+            regions.append((label_y - text_height - 2, label_y + baseline + 2,
+                            x_pos - 2, x_pos + text_width + 2))
+        
+        patches = []
+        for y0, y1, x0, x1 in regions:
+            y0, y1 = max(0, y0), min(frame_height, y1)
+            x0, x1 = max(0, x0), min(frame_width, x1)
+            if y1 > y0 and x1 > x0:
+                pixels = canvas[y0:y1, x0:x1].copy()
+                patches.append((y0, y1, x0, x1, pixels, pixels.any(axis=2).astype(np.uint8)))
+        return patches
     
     def _draw_status(self, frame: np.ndarray, frame_count: int, 
                      active_count: int, completed_count: int) -> None:
         """Draw status information on frame."""
-        # Draw dark background for status text
-        cv2.rectangle(frame, (0, 0), (frame.shape[1], 70), (0, 0, 0), -1)
+        # Dark background and title never change: copy them from a cached strip
+        if self._status_bar_shape != frame.shape:
+            self._status_bar = self._render_status_bar(frame.shape)
+            self._status_bar_shape = frame.shape
+        frame[:len(self._status_bar)] = self._status_bar
         
         status_text = f"Frame: {frame_count} | Active: {active_count} | Completed: {completed_count}"
         cv2.putText(frame, status_text, (10, 30), 
                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
         
-        cv2.putText(frame, "Gaze Tracking System", (10, 60), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 0, 255), 2)
-        
         # Add FPS if available
-        if hasattr(self, '_last_frame_time'):
-            current_time = cv2.getTickCount()
-            fps = cv2.getTickFrequency() / (current_time - self._last_frame_time)
+        current_time = cv2.getTickCount()
+        if self._last_frame_time:
+            fps = self._tick_freq / (current_time - self._last_frame_time)
             cv2.putText(frame, f"FPS: {fps:.1f}", (frame.shape[1] - 100, 30), 
                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
-        self._last_frame_time = cv2.getTickCount()
+        self._last_frame_time = current_time
+    
+    def _render_status_bar(self, shape: Tuple[int, ...]) -> np.ndarray:
+        """Render the constant part of the status bar: dark background and title."""
+        # Zero-filled strip is the dark background (rows 0-70 inclusive)
+        bar = np.zeros((min(71, shape[0]),) + tuple(shape[1:]), dtype=np.uint8)
+        cv2.putText(bar, "Gaze Tracking System", (10, 60), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 0, 255), 2)
+        return bar
     
     def _finalize_tracking(self) -> None:
         """Finalize all tracking and generate reports."""
         self.logger.info("Finalizing tracking sessions...")
         
+        metrics = self.get_metrics()
+        self.logger.info(
+            f"Frames captured: {metrics['frames_captured']}, "
+            f"processed: {metrics['frames_processed']} "
+            f"(avg {metrics['avg_process_ms']:.1f} ms, "
+            f"max {metrics['process_seconds_max'] * 1000:.1f} ms per frame)"
+        )
+        
         # Finalize remaining active faces
         self.face_tracker.finalize_all_sessions()
         
@@ -459,39 +743,61 @@ class GazeTrackingSystem:
         self.face_detection.close()
         self.face_mesh.close()
     
-    def process_live_camera(self, camera_id: int = 0) -> None: #calls _detect_faces and _visualize_frame and _finalize_tracking from GazeTrackingSystem - update from face_tracker
-        """Process live camera feed."""
+    def process_live_camera(self, camera_id: int = 0, 
+                            capture: Optional[cv2.VideoCapture] = None) -> None: #calls _detect_faces and _visualize_frame and _finalize_tracking from GazeTrackingSystem - update from face_tracker
+        """Process live camera feed, reusing an already opened capture if given."""
         self.logger.info(f"Starting live camera processing (camera {camera_id})")
         
-        cap = cv2.VideoCapture(camera_id)
+        cap = capture if capture is not None else cv2.VideoCapture(camera_id)
         if not cap.isOpened():
             self.logger.error(f"Failed to open camera {camera_id}")
             return
         
-        # Set camera properties for better performance
+        # Set camera properties for better performance. Compressed MJPG must be
+        # requested before the resolution: raw YUYV saturates USB 2.0 at 720p
+        if self.camera_fourcc:
+            cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self.camera_fourcc))
         cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
         cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
         cap.set(cv2.CAP_PROP_FPS, 30)
+        # Keep the driver from queueing stale frames ahead of the reader thread
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        fourcc = int(cap.get(cv2.CAP_PROP_FOURCC))
+        if fourcc > 0:
+            self.logger.info(f"Camera format: {fourcc.to_bytes(4, 'little').decode('ascii', 'replace')}")
         
-        frame_count = 0
+        # Capture runs on its own thread; when processing falls behind the oldest
+        # queued frames are dropped so the display stays close to real time.
+        # Without a display, frames between frame_skip steps are grabbed but never decoded.
+        # A dropped camera frame is retried rather than ending the session.
+        reader = ThreadedFrameReader(
+            cap,
+            queue_size=self.frame_queue_size,
+            drop_oldest=self.drop_stale_frames,
+            frame_filter=None if self.display_output else (lambda n: n % self.frame_skip == 0),
+            max_consecutive_failures=self.max_consecutive_failures
+        ).start()
         
+        last_frame = 0
         try:
             while True:
-                success, frame = cap.read()
-                if not success:
-                    self.logger.warning("Failed to read from camera")
-                    continue
+                item = reader.read()
+                if item is None:
+                    self.logger.warning("Camera stream ended")
+                    self.metrics['frames_captured'] += reader.frames_grabbed - last_frame
+                    break
                 
-                frame_count += 1
+                frame_count, frame = item
+                self.metrics['frames_captured'] += frame_count - last_frame
+                last_frame = frame_count
                 
                 # Process frame
                 if frame_count % self.frame_skip == 0:
-                    detected_faces = self._detect_faces(frame)
-                    self.face_tracker.update(detected_faces, frame_count)
+                    self._process_frame(frame, frame_count)
                 
                 # Visualize
-                if self.display_output:
-                    visualization = self._visualize_frame(frame, frame_count)
+                if self.display_output and self._display_due():
+                    visualization = self._visualize_frame(frame, frame_count, inplace=True)
                     cv2.imshow("Live Gaze Tracking", visualization)
                     
                     key = cv2.waitKey(1) & 0xFF
@@ -503,7 +809,10 @@ class GazeTrackingSystem:
                         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                         screenshot_path = f"screenshot_{timestamp}.png"
                         cv2.imwrite(screenshot_path, visualization)
-                        self.logger.info(f"Screenshot saved: {screenshot_path}")
+                        self.logger.info("Screenshot saved: %s", screenshot_path)
+                
+                # Frame is no longer referenced; let the reader decode into it again
+                reader.release(frame)
         
         except KeyboardInterrupt:
             self.logger.info("Keyboard interrupt received")
@@ -513,31 +822,63 @@ class GazeTrackingSystem:
             raise
         
         finally:
+            reader.stop()
+            stats = reader.get_stats()
+            self.logger.info(
+                f"Capture stats: {stats['capture_fps']:.1f} fps captured, "
+                f"{stats['process_fps']:.1f} fps processed, "
+                f"{stats['dropped_frames']} frames dropped, "
+                f"{stats['read_failures']} failed reads, "
+                f"queue high-water {stats['high_water']}/{self.frame_queue_size}"
+            )
             cap.release()
             cv2.destroyAllWindows()
             self._finalize_tracking()
 
 
+DEFAULT_CONFIG = {
+    'fps': 30.0,
+    'frame_skip': 1, 
+    'iou_threshold': 0.1,
+    'max_frames_missing': 5, 
+    'min_session_duration': 0.5,
+    'max_gaze_history': None,
+    'frame_queue_size': 8,
+    'drop_stale_frames': True,
+    'camera_fourcc': 'MJPG',
+    'max_consecutive_failures': 30,
+    'hw_decode': True,
+    'pipeline_detection': False,
+    'detection_confidence': 0.3,
+    'detect_max_dim': None,
+    'mesh_confidence': 0.2,
+    'mesh_tracking_confidence': 0.5,
+    'mesh_padding': 0.3,
+    'mesh_cache_iou': 0.9,
+    'mesh_cache_frames': 0,
+    'motion_threshold': None,
+    'motion_refresh_frames': 30,
+    'pose_estimator': 'mediapipe',
+    'zone_mapper': 'bakery',
+    'display_output': True,
+    'display_fps': None,
+    'save_output': False,
+    'console_output': True,
+    'database_output': False,
+    'json_output': False,
+    'json_format': 'files',
+    'json_indent': 2,
+    'async_analytics': True,
+    'opencv_threads': None,
+    'verbose': True,
+    'logging_level': 'INFO'
+}
+
+
 def load_config(config_path: Optional[str] = None) -> dict:
     """Load configuration from file or use defaults."""
-    default_config = {
-        'fps': 30.0,
-        'frame_skip': 1, 
-        'iou_threshold': 0.1,
-        'max_frames_missing': 5, 
-        'min_session_duration': 0.5,
-        'detection_confidence': 0.3,
-        'mesh_confidence': 0.2,
-        'pose_estimator': 'mediapipe',
-        'zone_mapper': 'bakery',
-        'display_output': True,
-        'save_output': False,
-        'console_output': True,
-        'database_output': False,
-        'json_output': False,
-        'verbose': True,
-        'logging_level': 'INFO'
-    }
+    # Fresh copy so one caller's overrides never leak into another's config
+    default_config = copy.deepcopy(DEFAULT_CONFIG)
     
     if config_path and Path(config_path).exists():
         try:
@@ -545,10 +886,10 @@ def load_config(config_path: Optional[str] = None) -> dict:
                 config = json.load(f)
                 # Merge with defaults
                 default_config.update(config)
-                print(f"Loaded configuration from: {config_path}")
+                logger.info("Loaded configuration from: %s", config_path)
         except Exception as e:
-            print(f"Error loading config file: {e}")
-            print("Using default configuration")
+            logger.warning("Error loading config file: %s", e)
+            logger.warning("Using default configuration")
     
     return default_config
 
@@ -602,8 +943,24 @@ Examples:
     
     args = parser.parse_args()
     
-    # Validate input
-    if not validate_input(args.input):
+    # Validate input. A camera is opened once here and handed to the system
+    # instead of being probed, released and opened again.
+    camera_id = None
+    capture = None
+    try:
+        camera_id = int(args.input)
+    except ValueError:
+        pass
+    
+    if camera_id is not None:
+        capture = cv2.VideoCapture(camera_id)
+        is_valid = capture.isOpened()
+    else:
+        is_valid = validate_input(args.input)
+    
+    if not is_valid:
+        if capture is not None:
+            capture.release()
         print(f"Error: Invalid input '{args.input}'")
         print("Please provide a valid video file path or camera ID")
         sys.exit(1)
@@ -657,10 +1014,9 @@ Examples:
         system = GazeTrackingSystem(config)
         
         # Process input
-        try:
-            camera_id = int(args.input)
-            system.process_live_camera(camera_id)
-        except ValueError:
+        if camera_id is not None:
+            system.process_live_camera(camera_id, capture=capture)
+        else:
             # Input is a file path
             system.process_video(args.input)
             
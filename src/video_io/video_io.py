@@ -0,0 +1,353 @@
+# video_io.py
+"""
+Video I/O module for decoupling frame capture from frame processing.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from collections import defaultdict, deque
+import queue
+import threading
+import time
+
+import cv2
+import numpy as np
+
+
+def open_capture(source: Union[str, int],
+                 hw_acceleration: bool = False) -> cv2.VideoCapture:
+    """Open a video file or camera, requesting hardware decode for files when enabled."""
+    if hw_acceleration and isinstance(source, str):
+        cap = cv2.VideoCapture(source, cv2.CAP_FFMPEG, [
+            cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY
+        ])
+        if cap.isOpened():
+            return cap
+        # FFmpeg backend unavailable for this source; use the default backend
+        cap.release()
+
+    return cv2.VideoCapture(source)
+
+
+class FramePool:
+    """Pool of reusable frame buffers keyed by (shape, dtype)."""
+
+    def __init__(self, max_per_key: int = 16):
+        self.max_per_key = max_per_key
+        self._buffers: Dict[Tuple, List[np.ndarray]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def acquire(self, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """Get a buffer of the given shape, allocating one if the pool is empty."""
+        key = (tuple(shape), np.dtype(dtype))
+        with self._lock:
+            free = self._buffers[key]
+            if free:
+                return free.pop()
+        return np.empty(shape, dtype=dtype)
+
+    def release(self, buffer: np.ndarray) -> None:
+        """Return a buffer to the pool for reuse."""
+        key = (buffer.shape, buffer.dtype)
+        with self._lock:
+            free = self._buffers[key]
+            if len(free) < self.max_per_key:
+                free.append(buffer)
+
+
+class ThreadedFrameReader:
+    """Read frames from a capture on a background thread into a bounded buffer.
+
+    With drop_oldest=False a full buffer blocks the capture thread (back-pressure,
+    no frames lost). With drop_oldest=True the oldest queued frame is evicted
+    instead, which keeps live-stream latency bounded when processing falls behind.
+
+    Frames are decoded into buffers from a FramePool; callers hand them back
+    with release() once a frame is no longer referenced. If frame_filter is
+    given, frames it rejects (by frame number) are grabbed without decoding
+    and never queued.
+
+    A failed read ends the stream, which is right for files. Live cameras
+    drop the odd frame, so with max_consecutive_failures > 0 a failed read is
+    retried after retry_interval seconds, and the stream only ends after that
+    many failures in a row.
+    """
+
+    def __init__(self, capture: cv2.VideoCapture, queue_size: int = 8,
+                 drop_oldest: bool = False,
+                 frame_filter: Optional[Callable[[int], bool]] = None,
+                 max_consecutive_failures: int = 0, retry_interval: float = 0.01):
+        self.capture = capture
+        self.queue_size = queue_size
+        self.drop_oldest = drop_oldest
+        self.frame_filter = frame_filter
+        self.max_consecutive_failures = max_consecutive_failures
+        self.retry_interval = retry_interval
+        self._frames = deque()
+        self._pool = FramePool(max_per_key=queue_size + 2)
+        self._cond = threading.Condition()
+        self._stop_event = threading.Event()
+        self._capture_done = False
+        self._thread = threading.Thread(target=self._capture_loop,
+                                        name="frame-reader", daemon=True)
+
+        # Statistics
+        self.frames_grabbed = 0 # every frame read from the capture, including filtered ones
+        self.frames_captured = 0
+        self.frames_consumed = 0
+        self.dropped_frames = 0
+        self.read_failures = 0
+        self.high_water = 0
+        self._start_time: Optional[float] = None
+
+    def start(self) -> "ThreadedFrameReader":
+        """Start the capture thread."""
+        self._start_time = time.monotonic()
+        self._thread.start()
+        return self
+
+    def _capture_loop(self) -> None:
+        """Read frames until the stream ends or the reader is stopped."""
+        frame_number = 0
+        frame_shape = None
+        failures = 0 # consecutive failed reads
+        while not self._stop_event.is_set():
+            if self.frame_filter is not None and not self.frame_filter(frame_number + 1):
+                # Frame will not be used: advance the stream without decoding it
+                if not self.capture.grab():
+                    failures += 1
+                    if not self._retry_after_failure(failures):
+                        break
+                    continue
+                failures = 0
+                frame_number += 1
+                self.frames_grabbed = frame_number
+                continue
+
+            buffer = self._pool.acquire(frame_shape) if frame_shape else None
+            success, frame = self.capture.read(buffer)
+            if not success:
+                if buffer is not None:
+                    self._pool.release(buffer)
+                failures += 1
+                if not self._retry_after_failure(failures):
+                    break
+                continue
+            failures = 0
+
+            if frame is not buffer:
+                # First frame, or the backend could not decode in place
+                frame_shape = frame.shape
+                if buffer is not None:
+                    self._pool.release(buffer)
+
+            frame_number += 1
+            self.frames_grabbed = frame_number
+            if not self._enqueue((frame_number, frame)):
+                break
+
+        with self._cond:
+            self._capture_done = True
+            self._cond.notify_all()
+
+    def _retry_after_failure(self, failures: int) -> bool:
+        """Count a failed read and wait before retrying. Returns False once the stream should end."""
+        self.read_failures += 1
+        if failures > self.max_consecutive_failures:
+            return False
+        # Wakes early if the reader is stopped
+        return not self._stop_event.wait(self.retry_interval)
+
+    def _enqueue(self, item: Tuple[int, np.ndarray]) -> bool:
+        """Add a frame to the buffer. Returns False if the reader was stopped."""
+        with self._cond:
+            if len(self._frames) >= self.queue_size:
+                if self.drop_oldest:
+                    _, dropped = self._frames.popleft()
+                    self._pool.release(dropped)
+                    self.dropped_frames += 1
+                else:
+                    self._cond.wait_for(
+                        lambda: len(self._frames) < self.queue_size
+                        or self._stop_event.is_set()
+                    )
+                    if self._stop_event.is_set():
+                        return False
+
+            self._frames.append(item)
+            self.frames_captured += 1
+            self.high_water = max(self.high_water, len(self._frames))
+            self._cond.notify_all()
+        return True
+
+    def read(self) -> Optional[Tuple[int, np.ndarray]]:
+        """Block until the next (frame_number, frame) pair; None when the stream ends."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._frames or self._capture_done)
+            if not self._frames:
+                return None
+
+            item = self._frames.popleft()
+            self.frames_consumed += 1
+            self._cond.notify_all()
+            return item
+
+    def release(self, frame: np.ndarray) -> None:
+        """Return a frame obtained from read() so its buffer can be reused."""
+        self._pool.release(frame)
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get queue and throughput statistics."""
+        elapsed = time.monotonic() - self._start_time if self._start_time else 0.0
+        with self._cond:
+            queue_depth = len(self._frames)
+
+        return {
+            'queue_depth': queue_depth,
+            'dropped_frames': self.dropped_frames,
+            'read_failures': self.read_failures,
+            'capture_fps': self.frames_captured / elapsed if elapsed > 0 else 0.0,
+            'process_fps': self.frames_consumed / elapsed if elapsed > 0 else 0.0,
+            'high_water': self.high_water
+        }
+
+    def stop(self) -> None:
+        """Stop the capture thread. The capture itself is left open."""
+        self._stop_event.set()
+        with self._cond:
+            self._cond.notify_all()
+
+        if self._thread.is_alive():
+            self._thread.join()
+
+        with self._cond:
+            self._frames.clear()
+            self._capture_done = True
+
+
+class ThreadedVideoWriter:
+    """Encode frames to a cv2.VideoWriter on a background thread.
+
+    write() hands the frame to a bounded queue and returns; the queue blocks
+    when full so a slow encoder back-pressures the caller instead of buffering
+    without limit. Frames must not be modified after being written.
+    """
+
+    def __init__(self, writer: cv2.VideoWriter, queue_size: int = 8):
+        self.writer = writer
+        self._frames = queue.Queue(maxsize=queue_size)
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._write_loop,
+                                        name="frame-writer", daemon=True)
+
+    def start(self) -> "ThreadedVideoWriter":
+        """Start the writer thread."""
+        self._thread.start()
+        return self
+
+    def _write_loop(self) -> None:
+        """Encode queued frames until the None sentinel arrives."""
+        while True:
+            frame = self._frames.get()
+            if frame is None:
+                return
+            if self._error is None:
+                try:
+                    self.writer.write(frame)
+                except Exception as e:
+                    # Keep draining so write() never blocks on a dead encoder
+                    self._error = e
+
+    def write(self, frame: np.ndarray) -> None:
+        """Queue a frame for encoding, blocking while the queue is full."""
+        if self._error is not None:
+            raise self._error
+        self._frames.put(frame)
+
+    def release(self) -> None:
+        """Encode the remaining frames, stop the thread and release the writer."""
+        if self._thread.is_alive():
+            self._frames.put(None)
+            self._thread.join()
+        self.writer.release()
+        if self._error is not None:
+            raise self._error
+
+
+class PipelineExecutor:
+    """Run a per-frame stage on a worker thread between a ThreadedFrameReader and the caller.
+
+    Capture, the stage and the caller's own work each get a thread, so the stage
+    for one frame overlaps the caller's handling of the previous one. Results
+    go through a bounded queue: a slow caller blocks the stage, which in turn
+    blocks the reader, so memory stays bounded. The stage must not share
+    mutable state with the caller.
+    """
+
+    _END = object()
+
+    def __init__(self, reader: ThreadedFrameReader,
+                 stage: Callable[[int, np.ndarray], Any], queue_size: int = 4):
+        self.reader = reader
+        self.stage = stage
+        self._results = queue.Queue(maxsize=queue_size)
+        self._stop_event = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._finished = False
+        self._thread = threading.Thread(target=self._stage_loop,
+                                        name="pipeline-stage", daemon=True)
+
+    def start(self) -> "PipelineExecutor":
+        """Start the reader and the stage thread."""
+        self.reader.start()
+        self._thread.start()
+        return self
+
+    def _stage_loop(self) -> None:
+        """Apply the stage to every frame from the reader."""
+        try:
+            while not self._stop_event.is_set():
+                item = self.reader.read()
+                if item is None:
+                    break
+
+                frame_number, frame = item
+                if not self._put((frame_number, frame, self.stage(frame_number, frame))):
+                    return
+        except Exception as e:
+            self._error = e
+
+        self._put(self._END)
+
+    def _put(self, item: Any) -> bool:
+        """Queue an item, waiting for space. Returns False if the executor was stopped."""
+        while not self._stop_event.is_set():
+            try:
+                self._results.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def read(self) -> Optional[Tuple[int, np.ndarray, Any]]:
+        """Block until the next (frame_number, frame, stage_result); None when the stream ends."""
+        if self._finished:
+            return None
+
+        item = self._results.get()
+        if item is self._END:
+            self._finished = True
+            if self._error is not None:
+                raise self._error
+            return None
+        return item
+
+    def release(self, frame: np.ndarray) -> None:
+        """Return a frame obtained from read() so its buffer can be reused."""
+        self.reader.release(frame)
+
+    def stop(self) -> None:
+        """Stop the reader and the stage thread and wait for both to exit."""
+        self._stop_event.set()
+        self.reader.stop()
+        if self._thread.is_alive():
+            self._thread.join()
@@ -0,0 +1,135 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from analytics_writer.analytics_writer import AggregateAnalytics, DatabaseAnalyticsWriter, JSONAnalyticsWriter
+from face_tracker.face_tracker import GazeHistory
+
+
+def make_session(session_id, records=0):
+    """Minimal completed session with the fields the writers read."""
+    zones = ['Left', 'Right']
+    gaze_history = GazeHistory()
+    for i in range(records):
+        gaze_history.append(i, zones[i // 7 % 2], i * 0.5, -i * 0.25, (i, 2 * i), i / 100.0, i / 30.0)
+
+    return SimpleNamespace(
+        id=session_id,
+        start_frame=10 * session_id,
+        end_frame=10 * session_id + 30,
+        total_duration=1.0,
+        zone_durations={'Left': 0.75, 'Right': 0.25},
+        unique_zones_visited=['Left', 'Right'],
+        avg_confidence=0.9,
+        total_zone_transitions=1,
+        peak_interest_zones=[('Left', 0.75), ('Right', 0.25)],
+        gaze_history=gaze_history
+    )
+
+
+def make_aggregate():
+    """Aggregate analytics with fixed values."""
+    return AggregateAnalytics(
+        total_sessions=2,
+        avg_session_duration=1.0,
+        total_time_tracked=2.0,
+        zone_popularity={'Left': 1.5, 'Right': 0.5},
+        avg_zones_per_session=2.0,
+        peak_hours=[(9, 2)],
+        conversion_zones=['Left'],
+        avg_engagement_score=0.5
+    )
+
+
+class TestJSONAnalyticsWriter:
+
+    def test_files_format_writes_one_file_per_session(self, tmp_path):
+        writer = JSONAnalyticsWriter(output_dir=str(tmp_path))
+        writer.write_session(make_session(1))
+        writer.write_session(make_session(2))
+        writer.write_aggregate(make_aggregate())
+        writer.close()
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            'aggregate_analytics.json', 'all_sessions.json', 'session_1.json', 'session_2.json'
+        ]
+        session = json.loads((tmp_path / 'session_2.json').read_text())
+        assert session['id'] == 2
+        all_sessions = json.loads((tmp_path / 'all_sessions.json').read_text())
+        assert [s['id'] for s in all_sessions] == [1, 2]
+
+    def test_ndjson_format_appends_one_line_per_session(self, tmp_path):
+        writer = JSONAnalyticsWriter(output_dir=str(tmp_path), json_format='ndjson')
+        writer.write_session(make_session(1))
+        writer.write_session(make_session(2))
+        writer.write_aggregate(make_aggregate())
+        writer.close()
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            'aggregate_analytics.json', 'sessions.ndjson'
+        ]
+        lines = (tmp_path / 'sessions.ndjson').read_text().splitlines()
+        assert [json.loads(line)['id'] for line in lines] == [1, 2]
+
+    def test_indent_only_applies_to_session_output(self, tmp_path):
+        writer = JSONAnalyticsWriter(output_dir=str(tmp_path), indent=None)
+        writer.write_session(make_session(1))
+        writer.write_aggregate(make_aggregate())
+        writer.close()
+
+        assert '\n' not in (tmp_path / 'session_1.json').read_text()
+        assert '\n' not in (tmp_path / 'all_sessions.json').read_text()
+        assert (tmp_path / 'aggregate_analytics.json').read_text() == json.dumps(
+            json.loads((tmp_path / 'aggregate_analytics.json').read_text()), indent=2)
+
+    def test_unknown_format_is_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            JSONAnalyticsWriter(output_dir=str(tmp_path), json_format='xml')
+
+
+class TestDatabaseAnalyticsWriter:
+
+    def test_import_does_not_register_sqlite_adapters(self):
+        # Fresh interpreter: other tests may already have created a database writer
+        code = (
+            "import sqlite3, sys, numpy as np\n"
+            f"sys.path.insert(0, {str(Path(__file__).parent.parent / 'src')!r})\n"
+            "import analytics_writer.analytics_writer as aw\n"
+            "key = (np.int64, sqlite3.PrepareProtocol)\n"
+            "assert key not in sqlite3.adapters\n"
+            "aw.DatabaseAnalyticsWriter(':memory:').close()\n"
+            "assert key in sqlite3.adapters\n"
+        )
+        subprocess.run([sys.executable, '-c', code], check=True)
+
+    def test_numpy_scalars_bind_as_numbers(self):
+        writer = DatabaseAnalyticsWriter(':memory:')
+        writer.conn.execute("CREATE TABLE t (i INTEGER, f REAL)")
+        writer.conn.execute("INSERT INTO t VALUES (?, ?)", (np.int64(3), np.float32(0.5)))
+
+        assert writer.conn.execute("SELECT i, f FROM t").fetchone() == (3, 0.5)
+        writer.close()
+
+    def test_gaze_history_sampled_every_tenth_record(self):
+        writer = DatabaseAnalyticsWriter(':memory:')
+        session = make_session(1, records=25)
+        writer.write_session(session)
+
+        rows = writer.conn.execute(
+            "SELECT session_id, frame, zone, yaw, pitch, position_x, position_y, confidence, timestamp "
+            "FROM gaze_history ORDER BY frame").fetchall()
+        expected = [
+            (1, r.frame, r.zone, r.yaw, r.pitch, r.position[0], r.position[1], r.confidence, r.timestamp)
+            for r in list(session.gaze_history)[::10]
+        ]
+        assert rows == expected
+        assert [row[1] for row in rows] == [0, 10, 20]
+        writer.close()
@@ -0,0 +1,95 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from face_tracker.face_tracker import GazeHistory, GazeRecord
+
+
+ZONES = ["Left", "Right", "Center", "Unknown"]
+
+
+def make_record(frame, zone):
+    """Build a record whose fields are all derived from the frame number."""
+    return GazeRecord(frame=frame, zone=zone, yaw=frame * 0.5, pitch=-frame * 0.25,
+                      position=(frame, 2 * frame), confidence=frame / 1000.0,
+                      timestamp=frame / 30.0)
+
+
+def fill(history, records):
+    """Append records to a GazeHistory."""
+    for r in records:
+        history.append(r.frame, r.zone, r.yaw, r.pitch, r.position, r.confidence, r.timestamp)
+
+
+def count_transitions(zones):
+    """Reference transition count over a plain list of zones."""
+    return sum(1 for a, b in zip(zones, zones[1:]) if a != b)
+
+
+def assert_matches(history, expected):
+    """Check every accessor of a GazeHistory against a plain list of records."""
+    assert len(history) == len(expected)
+    assert list(history) == expected
+    assert history[:] == expected
+    assert history[1:-1:2] == expected[1:-1:2]
+    if expected:
+        assert history[0] == expected[0]
+        assert history[-1] == expected[-1]
+    assert history.zones == [r.zone for r in expected]
+    assert history.frames.tolist() == [r.frame for r in expected]
+    assert history.yaws.tolist() == [r.yaw for r in expected]
+    assert history.pitches.tolist() == [r.pitch for r in expected]
+    assert [tuple(p) for p in history.positions.tolist()] == [r.position for r in expected]
+    assert history.confidences.tolist() == [r.confidence for r in expected]
+    assert history.timestamps.tolist() == [r.timestamp for r in expected]
+
+
+class TestGazeHistory:
+
+    def test_unbounded_growth_keeps_every_record(self):
+        rng = random.Random(0)
+        records = [make_record(i, rng.choice(ZONES)) for i in range(300)]
+        history = GazeHistory(capacity=4)
+        fill(history, records)
+
+        assert_matches(history, records)
+        assert history.zone_transitions == count_transitions([r.zone for r in records])
+
+    @pytest.mark.parametrize("max_length", [1, 2, 3, 7, 64, 100])
+    def test_ring_buffer_matches_list_reference(self, max_length):
+        rng = random.Random(max_length)
+        history = GazeHistory(max_length=max_length)
+        reference = []
+
+        # Enough appends to wrap past the capacity many times
+        for i in range(25 * max_length + 13):
+            record = make_record(i, rng.choice(ZONES))
+            fill(history, [record])
+            reference.append(record)
+
+            assert_matches(history, reference[-max_length:])
+            assert history.zone_transitions == count_transitions([r.zone for r in reference])
+            assert len(history._frame) <= max(2, 2 * max_length)
+
+    def test_max_length_one_keeps_newest_record(self):
+        history = GazeHistory(max_length=1)
+        fill(history, [make_record(1, "Left"), make_record(2, "Left"), make_record(3, "Right")])
+
+        assert list(history) == [make_record(3, "Right")]
+        assert history.zone_transitions == 1
+        with pytest.raises(IndexError):
+            history[1]
+
+    def test_transitions_counted_across_eviction(self):
+        history = GazeHistory(max_length=2)
+        zones = ["Left", "Left", "Right", "Right", "Right", "Left", "Center", "Center"]
+        fill(history, [make_record(i, zone) for i, zone in enumerate(zones)])
+
+        # Only the last two records remain, but all three changes were seen
+        assert history.zones == ["Center", "Center"]
+        assert history.zone_transitions == 3
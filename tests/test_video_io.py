@@ -0,0 +1,233 @@
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from video_io.video_io import FramePool, PipelineExecutor, ThreadedFrameReader, ThreadedVideoWriter
+
+
+class FakeCapture:
+    """Capture stand-in whose frame N is a small array filled with N."""
+
+    def __init__(self, frame_count=None, shape=(4, 6, 3), fail_at=()):
+        self.frame_count = frame_count # None for an endless stream
+        self.shape = shape
+        self.fail_at = list(fail_at) # call numbers (1-based) that fail like a dropped camera frame
+        self.position = 0
+        self.decoded = 0
+        self.calls = 0
+
+    def _advance(self):
+        self.calls += 1
+        if self.calls in self.fail_at:
+            return False
+        if self.frame_count is not None and self.position >= self.frame_count:
+            return False
+        self.position += 1
+        return True
+
+    def grab(self):
+        return self._advance()
+
+    def read(self, buffer=None):
+        if not self._advance():
+            return False, None
+        self.decoded += 1
+        frame = buffer if buffer is not None else np.empty(self.shape, dtype=np.uint8)
+        frame[:] = self.position % 256
+        return True, frame
+
+
+class FailingWriter:
+    """VideoWriter stand-in that fails on the second frame."""
+
+    def __init__(self):
+        self.written = 0
+        self.released = False
+
+    def write(self, frame):
+        if self.written == 1:
+            raise IOError("encoder failed")
+        self.written += 1
+
+    def release(self):
+        self.released = True
+
+
+def wait_until(condition, timeout=2.0):
+    """Poll a condition until it holds or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.005)
+    return condition()
+
+
+def read_all(reader):
+    """Drain a reader, returning the frame numbers and the value each frame holds."""
+    items = []
+    while True:
+        item = reader.read()
+        if item is None:
+            return items
+        frame_number, frame = item
+        items.append((frame_number, int(frame[0, 0, 0])))
+        reader.release(frame)
+
+
+class TestFramePool:
+
+    def test_released_buffer_is_reused(self):
+        pool = FramePool(max_per_key=1)
+        buffer = pool.acquire((4, 6, 3))
+        pool.release(buffer)
+
+        assert pool.acquire((4, 6, 3)) is buffer
+        assert pool.acquire((4, 6, 3)) is not buffer
+
+
+class TestThreadedFrameReader:
+
+    def test_end_of_stream_returns_none(self):
+        reader = ThreadedFrameReader(FakeCapture(3)).start()
+
+        assert read_all(reader) == [(1, 1), (2, 2), (3, 3)]
+        assert reader.read() is None
+        reader.stop()
+
+    def test_full_queue_blocks_without_losing_frames(self):
+        capture = FakeCapture(20)
+        reader = ThreadedFrameReader(capture, queue_size=2, drop_oldest=False).start()
+
+        # The capture thread stalls once the queue is full
+        assert wait_until(lambda: reader.high_water == 2)
+        time.sleep(0.05)
+        assert capture.position == 3
+
+        assert read_all(reader) == [(n, n) for n in range(1, 21)]
+        assert reader.dropped_frames == 0
+        assert reader.frames_captured == 20
+        reader.stop()
+
+    def test_drop_oldest_counts_dropped_frames(self):
+        reader = ThreadedFrameReader(FakeCapture(10), queue_size=2, drop_oldest=True).start()
+        reader._thread.join(timeout=2.0)
+
+        assert reader.dropped_frames == 8
+        assert reader.get_stats()['dropped_frames'] == 8
+        assert read_all(reader) == [(9, 9), (10, 10)]
+
+    def test_frame_filter_numbering(self):
+        capture = FakeCapture(10)
+        reader = ThreadedFrameReader(capture, frame_filter=lambda n: n % 3 == 0).start()
+
+        assert read_all(reader) == [(3, 3), (6, 6), (9, 9)]
+        assert reader.frames_grabbed == 10
+        assert reader.frames_captured == 3
+        assert capture.decoded == 3
+
+    def test_file_stream_ends_on_first_failed_read(self):
+        reader = ThreadedFrameReader(FakeCapture(5, fail_at=[3])).start()
+
+        assert read_all(reader) == [(1, 1), (2, 2)]
+        reader.stop()
+
+    def test_failed_read_is_retried(self):
+        capture = FakeCapture(5, fail_at=[3])
+        reader = ThreadedFrameReader(capture, max_consecutive_failures=3,
+                                     retry_interval=0.001).start()
+
+        assert read_all(reader) == [(n, n) for n in range(1, 6)]
+        # The dropped frame, then the end of the stream tried 1 + 3 times
+        assert reader.read_failures == 5
+        reader.stop()
+
+    def test_failed_grab_is_retried(self):
+        capture = FakeCapture(6, fail_at=[2, 3])
+        reader = ThreadedFrameReader(capture, frame_filter=lambda n: n % 2 == 0,
+                                     max_consecutive_failures=2, retry_interval=0.001).start()
+
+        assert read_all(reader) == [(2, 2), (4, 4), (6, 6)]
+        assert reader.frames_grabbed == 6
+        reader.stop()
+
+    def test_live_stream_ends_after_consecutive_failures(self):
+        # Live configuration: stale frames dropped, stream fails for good partway through
+        capture = FakeCapture(fail_at=[4, 7, 8] + list(range(12, 40)))
+        reader = ThreadedFrameReader(capture, queue_size=2, drop_oldest=True,
+                                     max_consecutive_failures=3, retry_interval=0.001).start()
+        reader._thread.join(timeout=2.0)
+
+        assert not reader._thread.is_alive()
+        # Isolated failures are retried; four failures in a row end the stream
+        assert capture.calls == 15
+        assert reader.frames_captured == 8
+        assert reader.dropped_frames == 6
+        assert read_all(reader) == [(7, 7), (8, 8)]
+        assert reader.read() is None
+
+    def test_stop_while_blocked_on_full_queue(self):
+        reader = ThreadedFrameReader(FakeCapture(), queue_size=1).start()
+        assert wait_until(lambda: reader.high_water == 1)
+
+        reader.stop()
+
+        assert not reader._thread.is_alive()
+        assert reader.read() is None
+
+
+class TestThreadedVideoWriter:
+
+    def test_encoder_error_is_raised_on_release(self):
+        writer = FailingWriter()
+        threaded = ThreadedVideoWriter(writer).start()
+        frame = np.zeros((4, 6, 3), dtype=np.uint8)
+        threaded.write(frame)
+        threaded.write(frame)
+        threaded.write(frame)
+
+        with pytest.raises(IOError):
+            threaded.release()
+        assert writer.written == 1
+        assert writer.released
+        with pytest.raises(IOError):
+            threaded.write(frame)
+
+
+class TestPipelineExecutor:
+
+    def test_stage_results_follow_frames(self):
+        reader = ThreadedFrameReader(FakeCapture(5))
+        pipeline = PipelineExecutor(reader, lambda n, frame: n * 10).start()
+
+        results = []
+        while True:
+            item = pipeline.read()
+            if item is None:
+                break
+            frame_number, frame, result = item
+            results.append((frame_number, result))
+            pipeline.release(frame)
+
+        assert results == [(n, n * 10) for n in range(1, 6)]
+        pipeline.stop()
+
+    def test_stage_error_is_raised_on_read(self):
+        def stage(frame_number, frame):
+            if frame_number == 2:
+                raise ValueError("stage failed")
+            return frame_number
+
+        pipeline = PipelineExecutor(ThreadedFrameReader(FakeCapture(5)), stage).start()
+
+        assert pipeline.read()[0] == 1
+        with pytest.raises(ValueError):
+            pipeline.read()
+        assert pipeline.read() is None
+        pipeline.stop()